@@ -1,37 +1,99 @@
 import os
 
+from scorsese.services.jsonio import read_json, write_json_atomic
+
+CACHE_NAME = ".env.cache.json"
+_OLD_CACHE_NAME = ".env.cache.pkl"
+
+def _debug(msg):
+    # Chatty tracing only when DEBUG_ENV is set
+    if os.getenv("DEBUG_ENV"):
+        print(msg)
+
+def _parse_env_file(path):
+    """Reads a .env file into a dict, picking the codec from its BOM (UTF-8 if none)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    if raw.startswith((b"\xff\xfe", b"\xfe\xff")):
+        encoding = "utf-16"  # the codec consumes the BOM itself
+        text = raw.decode("utf-16")
+    elif raw.startswith(b"\xef\xbb\xbf"):
+        encoding = "utf-8"
+        text = raw[3:].decode("utf-8")
+    else:
+        encoding = "utf-8"
+        text = raw.decode("utf-8")
+    lines = text.splitlines()
+
+    _debug(f"Reading from {path} ({encoding})")
+    env_vars = {}
+    for line in lines:
+        key, sep, val = line.partition("=")
+        key = key.strip()
+        # Skips blanks, comments and lines without '='
+        if not sep or not key or key.startswith("#"): continue
+        _debug(f"Found line: {line.strip()}")
+        env_vars[key] = val.strip().strip("'").strip('"')
+    return env_vars
+
 def load_dotenv():
-    """Simple .env loader to avoid dependencies."""
+    """
+    Simple .env loader to avoid dependencies.
+    The parsed result is cached as JSON next to the .env (keyed by its mtime,
+    owner-only permissions) so later runs skip the decode until the file changes.
+    """
     paths_to_check = [
         ".env",
         os.path.join(os.path.dirname(__file__), "scorsese", ".env"),
         os.path.join(os.getcwd(), ".env")
     ]
-    
-    print(f"Checking CWD: {os.getcwd()}")
-    
+    # ".env" and CWD/.env are usually the same file; stat each candidate once
+    paths_to_check = list(dict.fromkeys(os.path.abspath(p) for p in paths_to_check))
+
+    _debug(f"Checking CWD: {os.getcwd()}")
+
     for path in paths_to_check:
-        print(f"Checking path: {path} - Exists? {os.path.exists(path)}")
-        if os.path.exists(path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            _debug(f"Checking path: {path} - Exists? False")
+            continue
+        _debug(f"Checking path: {path} - Exists? True")
+        cache_path = os.path.join(os.path.dirname(path), CACHE_NAME)
+        try:
+            # Earlier versions pickled the secrets; don't leave that copy around
+            os.remove(os.path.join(os.path.dirname(path), _OLD_CACHE_NAME))
+        except OSError:
+            pass
+
+        env_vars = None
+        try:
+            cached = read_json(cache_path)
+            if isinstance(cached, dict) and cached.get("mtime") == mtime and isinstance(cached.get("vars"), dict):
+                env_vars = cached["vars"]
+                _debug(f"Loaded {path} from cache ({cache_path})")
+        except (OSError, ValueError):
+            pass
+
+        if env_vars is None:
             try:
-                # Try UTF-8 first
-                encoding = "utf-8"
-                with open(path, "r", encoding="utf-8-sig") as f:
-                    lines = f.readlines()
-            except UnicodeError:
-                # Fallback
-                encoding = "utf-16"
-                with open(path, "r", encoding="utf-16") as f:
-                    lines = f.readlines()
+                env_vars = _parse_env_file(path)
             except Exception as e:
                 print(f"Error reading {path}: {e}")
                 continue
+            try:
+                # mkstemp-backed write: the cache is created 0600
+                write_json_atomic(cache_path, {"mtime": mtime, "vars": env_vars})
+            except OSError as e:
+                print(f"Could not write cache {cache_path}: {e}")
 
-            print(f"Reading from {path} ({encoding})")
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith("#"): continue
-                print(f"Found line: {line}")
-            return
+        for key, val in env_vars.items():
+            # Don't overwrite existing (empty values count as unset)
+            if not os.getenv(key):
+                os.environ[key] = val
+        return
 
-load_dotenv()
+if __name__ == "__main__":
+    os.environ.setdefault("DEBUG_ENV", "1")
+    load_dotenv()
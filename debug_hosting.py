@@ -1,167 +1,117 @@
 import sys
 import os
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-sys.path.append(os.getcwd())
-from scorsese.services.image_upload_service import ImageUploadService
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from scorsese.services.kie_client import KIEClient
+from scorsese.services.http_session import SESSION as _SESSION, HTTP_TIMEOUT, install_dns_cache, post_bytes
+from debug_env import load_dotenv
+
+install_dns_cache()
+
+PNG_NAME = "debug_test.png"
+
+def _check_kie(kie, url, label, log):
+    """Submits an image-to-video task for `url` and records whether KIE accepted it."""
+    log.append("Requesting Video Gen from KIE...")
+    task_id = kie.generate_video_from_image(url, prompt="A cat jumping", mode="normal")
+    log.append(f"Task ID: {task_id}")
+    
+    log.append("Waiting for KIE...")
+    status = kie.wait_for_task(task_id, timeout=60)
+    log.append(f"Final Status: {status}")
+    if status.get("state") == "success":
+        log.append(f"PASS: KIE accepts {label} URLs.")
+    else:
+        log.append("FAIL: KIE rejected or failed.")
+
+# TEST 1: tmpfiles.org with HTTPS
+def probe_tmpfiles(png_bytes, kie):
+    log = ["--- Testing tmpfiles.org (HTTPS) ---"]
+    try:
+        response = post_bytes("https://tmpfiles.org/api/v1/upload", PNG_NAME, png_bytes, content_type="image/png")
+        if response.status_code != 200:
+            log.append(f"Upload failed: {response.text}")
+        else:
+            data = response.json()
+            page_url = data['data']['url'] 
+            direct_url = page_url.replace("tmpfiles.org/", "tmpfiles.org/dl/")
+            direct_url = direct_url.replace("http://", "https://") # Force HTTPS
+            log.append(f"Direct URL: {direct_url}")
+            _check_kie(kie, direct_url, "tmpfiles.org (HTTPS)", log)
+    except Exception as e:
+        log.append(f"CRASH (tmpfiles): {e}")
+    return {"provider": "tmpfiles.org", "log": log}
+
+# TEST 3: file.io with JSON header (also covers the old curl-to-file.io test)
+def probe_fileio(png_bytes, kie):
+    log = ["--- Testing file.io (JSON Header) ---"]
+    try:
+        headers = {"Accept": "application/json"}
+        response = post_bytes("https://file.io", PNG_NAME, png_bytes, content_type="image/png", headers=headers)
+        log.append(f"Status: {response.status_code}")
+        log.append(f"Resp: {response.text[:200]}")
+        
+        if response.status_code == 200:
+            url = response.json().get("link")
+            log.append(f"URL: {url}")
+            _check_kie(kie, url, "file.io", log)
+    except Exception as e:
+        log.append(f"CRASH (file.io): {e}")
+    return {"provider": "file.io", "log": log}
+
+# TEST 5: Uguu.se
+def probe_uguu(png_bytes, kie):
+    log = ["--- Testing Uguu.se ---"]
+    try:
+        response = post_bytes("https://uguu.se/upload.php", PNG_NAME, png_bytes, field='files[]', content_type="image/png")
+        log.append(f"Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            # Response is JSON: {"success": true, "files": [{"url": "..."}]}
+            data = response.json()
+            if data.get("success"):
+                url = data["files"][0]["url"]
+                log.append(f"URL: {url}")
+                _check_kie(kie, url, "Uguu.se", log)
+    except Exception as e:
+        log.append(f"CRASH (uguu.se): {e}")
+    return {"provider": "uguu.se", "log": log}
+
+PROBES = [probe_tmpfiles, probe_fileio, probe_uguu]
 
 def test_hosting():
     print("Testing Hosting & Generation...")
     
-    # Load API Key safely
+    # Load API Key (load_dotenv seeds os.environ from the cached .env)
+    load_dotenv()
     api_key = os.getenv("KIE_API_KEY")
-    if not api_key:
-        try:
-            # Try utf-16 first due to BOM error, then utf-8
-            try:
-                with open(r"c:\Users\figon\zeebot\scorcese\scorsese\.env", "r", encoding="utf-16") as f:
-                    content = f.read()
-            except:
-                with open(r"c:\Users\figon\zeebot\scorcese\scorsese\.env", "r", encoding="utf-8") as f:
-                    content = f.read()
-            
-            for line in content.splitlines():
-                if line.startswith("KIE_API_KEY="):
-                    api_key = line.strip().split("=", 1)[1]
-                    break
-        except Exception as e:
-            print(f"Failed to read .env: {e}")
-            return
 
     if not api_key:
         print("No API Key found.")
         return
 
-    # Use a simpler local KIE client mock to avoid complex imports if possible, 
-    # but we need the real one.
-    from scorsese.services.kie_client import KIEClient
     kie = KIEClient(api_key=api_key)
-    uploader = ImageUploadService()
 
-    dummy_path = "debug_test.png"
     print("Downloading test image...")
     try:
-        r = requests.get("https://placehold.co/600x400/png")
-        with open(dummy_path, 'wb') as f:
-            f.write(r.content)
+        r = _SESSION.get("https://placehold.co/600x400/png", timeout=HTTP_TIMEOUT)
+        r.raise_for_status()
+        png_bytes = r.content
     except Exception as e:
         print(f"Download failed: {e}")
         return
         
-    # TEST 1: tmpfiles.org with HTTPS
-    try:
-        print("\n--- Testing tmpfiles.org (HTTPS) ---")
-        with open(dummy_path, 'rb') as f:
-            files = {'file': f}
-            response = requests.post("https://tmpfiles.org/api/v1/upload", files=files)
-            if response.status_code != 200:
-                print(f"Upload failed: {response.text}")
-            else:
-                data = response.json()
-                page_url = data['data']['url'] 
-                direct_url = page_url.replace("tmpfiles.org/", "tmpfiles.org/dl/")
-                direct_url = direct_url.replace("http://", "https://") # Force HTTPS
-                print(f"Direct URL: {direct_url}")
-                
-                print("Requesting Video Gen from KIE...")
-                task_id = kie.generate_video_from_image(direct_url, prompt="A cat jumping", mode="normal")
-                print(f"Task ID: {task_id}")
-                
-                print("Waiting for KIE...")
-                status = kie.wait_for_task(task_id, poll_interval=2, timeout=60)
-                print(f"Final Status: {status}")
-                if status.get("state") == "success":
-                    print("PASS: KIE accepts tmpfiles.org URLs (HTTPS).")
-                else:
-                    print("FAIL: KIE rejected or failed.")
-    except Exception as e:
-        print(f"CRASH (tmpfiles): {e}")
-
-    # TEST 3: file.io with JSON header
+    # Providers are independent and I/O-bound: probe them all at once and
+    # report each as it finishes. The image stays in memory throughout.
     try:
-        print("\n--- Testing file.io (JSON Header) ---")
-        with open(dummy_path, 'rb') as f:
-            files = {'file': f}
-            headers = {"Accept": "application/json"}
-            response = requests.post("https://file.io", files=files, headers=headers)
-            print(f"Status: {response.status_code}")
-            print(f"Resp: {response.text[:200]}")
-            
-            if response.status_code == 200:
-                url = response.json().get("link")
-                print(f"URL: {url}")
-                
-                print("Requesting Video Gen from KIE...")
-                task_id = kie.generate_video_from_image(url, prompt="A cat jumping", mode="normal")
-                print(f"Task ID: {task_id}")
-                
-                print("Waiting for KIE...")
-                status = kie.wait_for_task(task_id, poll_interval=2, timeout=60)
-                print(f"Final Status: {status}")
-                if status.get("state") == "success":
-                    print("PASS: KIE accepts file.io URLs.")
-                else:
-                    print("FAIL: KIE rejected or failed.")
-    except Exception as e:
-        print(f"CRASH (file.io): {e}")
-
-    # TEST 5: Uguu.se
-    try:
-        print("\n--- Testing Uguu.se ---")
-        with open(dummy_path, 'rb') as f:
-            files = {'files[]': f}
-            response = requests.post("https://uguu.se/upload.php", files=files)
-            print(f"Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                # Response is JSON: {"success": true, "files": [{"url": "..."}]}
-                data = response.json()
-                if data.get("success"):
-                    url = data["files"][0]["url"]
-                    print(f"URL: {url}")
-                    
-                    print("Requesting Video Gen from KIE...")
-                    task_id = kie.generate_video_from_image(url, prompt="A cat jumping", mode="normal")
-                    print(f"Task ID: {task_id}")
-                    
-                    print("Waiting for KIE...")
-                    status = kie.wait_for_task(task_id, poll_interval=2, timeout=60)
-                    print(f"Final Status: {status}")
-                    if status.get("state") == "success":
-                        print("PASS: KIE accepts Uguu.se URLs.")
-                    else:
-                        print("FAIL: KIE rejected or failed.")
-    except Exception as e:
-        print(f"CRASH (uguu.se): {e}")
-
-    # TEST 6: Curl to file.io
-    try:
-        print("\n--- Testing Curl to file.io ---")
-        import subprocess
-        # curl -F "file=@debug_test.png" https://file.io
-        cmd = ["curl", "-F", f"file=@{dummy_path}", "https://file.io"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        print(f"Curl Output: {result.stdout}")
-        
-        import json
-        try:
-            data = json.loads(result.stdout)
-            if data.get("success"):
-                url = data.get("link")
-                print(f"URL: {url}")
-                # Test KIE?
-                # ...
-        except:
-            print("Curl didn't return JSON")
-            
-    except Exception as e:
-        print(f"CRASH (curl): {e}")
-            
+        with ThreadPoolExecutor(max_workers=len(PROBES)) as ex:
+            futures = [ex.submit(probe, png_bytes, kie) for probe in PROBES]
+            for future in as_completed(futures):
+                result = future.result()
+                print("\n" + "\n".join(result["log"]))
     except Exception as e:
         print(f"CRASH: {e}")
-    finally:
-        if os.path.exists(dummy_path):
-            os.remove(dummy_path)
 
 if __name__ == "__main__":
     test_hosting()
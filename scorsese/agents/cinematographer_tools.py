@@ -6,9 +6,16 @@ Focused tools for shooting segments and managing footage.
 """
 
 import os
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output")
+PREVIEW_LEN = 100
+
+
+def _preview(prompt: str) -> str:
+    """Short prompt echo for tool results; the full prompt lives with the task."""
+    return prompt if len(prompt) <= PREVIEW_LEN else prompt[:PREVIEW_LEN] + "..."
 
 
 class CinematographerTools:
@@ -17,6 +24,15 @@ class CinematographerTools:
     def __init__(self, video_service=None, image_upload_service=None):
         self.video_service = video_service
         self.image_upload_service = image_upload_service
+        self._moviepy = None
+    
+    @property
+    def moviepy(self):
+        """MoviePyService, created on first frame extraction and reused after."""
+        if self._moviepy is None:
+            from scorsese.services.moviepy_service import MoviePyService
+            self._moviepy = MoviePyService()
+        return self._moviepy
     
     # --- Tool 1: shoot_segment ---
     def shoot_segment(self, prompt: str, mode: str = "normal", image_url: str = None) -> Dict[str, Any]:
@@ -40,7 +56,7 @@ class CinematographerTools:
             return {
                 "success": True,
                 "task_id": result.get("task_id") if isinstance(result, dict) else result,
-                "prompt": prompt[:100] + "..." if len(prompt) > 100 else prompt,
+                "prompt": _preview(prompt),
                 "mode": mode,
                 "has_reference_image": image_url is not None
             }
@@ -76,6 +92,24 @@ class CinematographerTools:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    def check_footage_many(self, task_ids: List[str]) -> Dict[str, Any]:
+        """
+        Checks several video generation tasks at once.
+        
+        Args:
+            task_ids: Task IDs from shoot_segment.
+            
+        Returns:
+            Per-task check_footage results, keyed by task ID.
+        """
+        if not task_ids:
+            return {"success": True, "results": {}}
+        
+        # Status polls are independent HTTP calls; run them side by side
+        with ThreadPoolExecutor(max_workers=min(8, len(task_ids))) as ex:
+            results = dict(zip(task_ids, ex.map(self.check_footage, task_ids)))
+        return {"success": True, "results": results}
+    
     # --- Tool 3: extend_shot ---
     def extend_shot(self, video_path: str, prompt: str, mode: str = "normal") -> Dict[str, Any]:
         """
@@ -94,9 +128,7 @@ class CinematographerTools:
         
         try:
             # Extract last frame
-            from scorsese.services.moviepy_service import MoviePyService
-            moviepy = MoviePyService()
-            frame_path = moviepy.extract_last_frame(video_path)
+            frame_path = self.moviepy.extract_last_frame(video_path)
             
             # Upload frame
             if self.image_upload_service:
@@ -112,7 +144,7 @@ class CinematographerTools:
                 "task_id": result.get("task_id") if isinstance(result, dict) else result,
                 "source_video": video_path,
                 "frame_url": frame_url,
-                "prompt": prompt[:100] + "..."
+                "prompt": _preview(prompt)
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -128,24 +160,27 @@ class CinematographerTools:
         Returns:
             URL of the uploaded frame.
         """
-        import tempfile
-        import requests
-        
-        # Download if URL
-        if video_path_or_url.startswith("http"):
-            temp_path = os.path.join(OUTPUT_DIR, f"temp_dl_{os.urandom(3).hex()}.mp4")
-            response = requests.get(video_path_or_url)
-            with open(temp_path, 'wb') as f:
-                f.write(response.content)
-            video_path = temp_path
-        else:
-            video_path = video_path_or_url
-        
+        temp_path = None
         try:
+            # Download if URL (requests only loads when a URL is actually given)
+            if video_path_or_url.startswith("http"):
+                import shutil
+                import tempfile
+                from scorsese.services.http_session import SESSION, HTTP_TIMEOUT
+                
+                os.makedirs(OUTPUT_DIR, exist_ok=True)
+                with SESSION.get(video_path_or_url, stream=True, timeout=HTTP_TIMEOUT) as response:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
+                    with tempfile.NamedTemporaryFile(dir=OUTPUT_DIR, prefix="temp_dl_", suffix=".mp4", delete=False) as f:
+                        temp_path = f.name
+                        shutil.copyfileobj(response.raw, f, length=1 << 16)
+                video_path = temp_path
+            else:
+                video_path = video_path_or_url
+            
             # Extract frame
-            from scorsese.services.moviepy_service import MoviePyService
-            moviepy = MoviePyService()
-            frame_path = moviepy.extract_last_frame(video_path)
+            frame_path = self.moviepy.extract_last_frame(video_path)
             
             # Upload
             if self.image_upload_service:
@@ -164,6 +199,13 @@ class CinematographerTools:
                 }
         except Exception as e:
             return {"success": False, "error": str(e)}
+        finally:
+            # Only the downloaded copy is ours to delete
+            if temp_path:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
     
     # --- Tool 5: upload_image ---
     def upload_image(self, file_path: str) -> Dict[str, Any]:
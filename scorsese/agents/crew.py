@@ -11,6 +11,8 @@ The USER is "The Producer" (boss).
 """
 
 import os
+import json
+import functools
 from typing import Optional
 
 try:
@@ -25,18 +27,21 @@ from .editor_tools import EditorTools
 from .cinematographer_tools import CinematographerTools
 
 
-# Load reference docs
-def _load_doc(filename: str) -> str:
-    """Load a reference doc from the project root."""
+def _dump(result) -> str:
+    """Serializes a tool result dict as JSON for the agent."""
+    return json.dumps(result, default=str)
+
+
+# Load reference docs (lazily, on first agent build)
+@functools.lru_cache(maxsize=4)
+def _load_doc(filename: str, max_chars: Optional[int] = 4096) -> str:
+    """Load (the head of) a reference doc from the project root. max_chars=None reads it all."""
     doc_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), filename)
     if os.path.exists(doc_path):
         with open(doc_path, 'r') as f:
-            return f.read()
+            return f.read(-1 if max_chars is None else max_chars)
     return ""
 
-MOVIEPY_REFERENCE = _load_doc("movie.py.txt")
-MANIM_REFERENCE = _load_doc("manim.txt")
-
 
 class ScorseseCrew:
     """
@@ -86,6 +91,7 @@ class ScorseseCrew:
     
     def _build_agents(self):
         """Create all agents with their tools and instructions."""
+        moviepy_reference = _load_doc("movie.py.txt", max_chars=3000)
         
         # --- SCREENWRITER ---
         @function_tool
@@ -152,27 +158,32 @@ Return ONLY the JSON array."""
         @function_tool
         def shoot_segment(prompt: str, mode: str = "normal", image_url: str = None) -> str:
             """Generates a video segment. Returns task ID."""
-            return str(self.cinematographer_tools.shoot_segment(prompt, mode, image_url))
+            return _dump(self.cinematographer_tools.shoot_segment(prompt, mode, image_url))
         
         @function_tool
         def check_footage(task_id: str) -> str:
             """Checks video generation status."""
-            return str(self.cinematographer_tools.check_footage(task_id))
+            return _dump(self.cinematographer_tools.check_footage(task_id))
+        
+        @function_tool
+        def check_footage_many(task_ids: list[str]) -> str:
+            """Checks several video generation tasks in one call."""
+            return _dump(self.cinematographer_tools.check_footage_many(task_ids))
         
         @function_tool
         def extend_shot(video_path: str, prompt: str, mode: str = "normal") -> str:
             """Extends a video using its last frame."""
-            return str(self.cinematographer_tools.extend_shot(video_path, prompt, mode))
+            return _dump(self.cinematographer_tools.extend_shot(video_path, prompt, mode))
         
         @function_tool
         def get_last_frame(video_path_or_url: str) -> str:
             """Extracts and uploads last frame for continuity."""
-            return str(self.cinematographer_tools.get_last_frame(video_path_or_url))
+            return _dump(self.cinematographer_tools.get_last_frame(video_path_or_url))
         
         @function_tool
         def upload_image(file_path: str) -> str:
             """Uploads local image to get public URL."""
-            return str(self.cinematographer_tools.upload_image(file_path))
+            return _dump(self.cinematographer_tools.upload_image(file_path))
         
         self.cinematographer = Agent(
             name="Cinematographer",
@@ -185,6 +196,7 @@ Return ONLY the JSON array."""
             TOOLS:
             - shoot_segment(prompt, mode, image_url): Generate video. ALWAYS pass image_url for first segment!
             - check_footage(task_id): Check if video is ready
+            - check_footage_many(task_ids): Check several tasks in one call (use this whenever more than one task is in flight)
             - extend_shot: Continue a video from last frame
             - get_last_frame: Extract frame for continuity
             
@@ -207,32 +219,35 @@ Return ONLY the JSON array."""
             PROMPT FORMAT:
             "Subject: [who]. Action: [what]. Environment: [where]. Technical: [camera]."
             """,
-            tools=[shoot_segment, check_footage, extend_shot, get_last_frame, upload_image]
+            tools=[shoot_segment, check_footage, check_footage_many, extend_shot, get_last_frame, upload_image]
         )
         
         # --- EDITOR ---
         @function_tool
-        def edit_video(task: str, script_code: str, save_name: str = None) -> str:
+        def edit_video(task: str, script_code: str, save_name: str = None, cache: bool = True) -> str:
             """
             Executes a MoviePy script for video editing.
             You must write complete Python code using MoviePy v2 syntax.
+            An identical script whose inputs and outputs are unchanged returns its
+            earlier result; pass cache=False to force a re-run (random or
+            time-dependent scripts, or retrying a bad render with the same code).
             """
-            return str(self.editor_tools.edit_video(task, script_code, save_name))
+            return _dump(self.editor_tools.edit_video(task, script_code, save_name, cache))
         
         @function_tool
         def render_animation(description: str, script_code: str) -> str:
             """Renders a Manim animation. Write complete Manim script with Scene class."""
-            return str(self.editor_tools.render_animation(description, script_code))
+            return _dump(self.editor_tools.render_animation(description, script_code))
         
         @function_tool
         def generate_music(prompt: str, instrumental: bool = True) -> str:
             """Generates music via Suno. Returns path to MP3."""
-            return str(self.editor_tools.generate_music(prompt, instrumental))
+            return _dump(self.editor_tools.generate_music(prompt, instrumental))
         
         @function_tool
         def change_voice(video_path: str, voice_id: str = "JBFqnCBsd6RMkjVDRZzb") -> str:
             """Changes voice in video via ElevenLabs."""
-            return str(self.editor_tools.change_voice(video_path, voice_id))
+            return _dump(self.editor_tools.change_voice(video_path, voice_id))
         
         self.editor = Agent(
             name="Editor",
@@ -262,7 +277,7 @@ Return ONLY the JSON array."""
             - Audio: `AudioFileClip("music.mp3")`
             - Write: `final.write_videofile("output.mp4")`
             
-            {f"Full MoviePy Reference: {MOVIEPY_REFERENCE[:3000]}" if MOVIEPY_REFERENCE else ""}
+            {f"Full MoviePy Reference: {moviepy_reference}" if moviepy_reference else ""}
             
             **Manim Reference:**
             - Import: `from manim import *`
@@ -292,7 +307,7 @@ Return ONLY the JSON array."""
         @function_tool
         def get_status(run_id: str = None) -> str:
             """Gets current project status including manifest and next action."""
-            return str(self.marty_tools.get_status(run_id))
+            return _dump(self.marty_tools.get_status(run_id))
         
         @function_tool
         def update_manifest(run_id: str, modifications_json: str) -> str:
@@ -300,25 +315,36 @@ Return ONLY the JSON array."""
             Updates the manifest. modifications_json should be a JSON array like:
             '[{"action": "update_prompt", "index": 1, "prompt": "new prompt"}]'
             Actions: update_prompt, update_image, swap, delete, set_status, add
+            All indices in one call refer to segment positions BEFORE the call;
+            deletes are applied at the end, so to delete segments 2 and 3 send
+            '[{"action": "delete", "index": 2}, {"action": "delete", "index": 3}]'.
             """
-            import json
             mods = json.loads(modifications_json)
-            return str(self.marty_tools.update_manifest(run_id, mods))
+            return _dump(self.marty_tools.update_manifest(run_id, mods))
+        
+        @function_tool
+        def generate_pending(run_id: str = None) -> str:
+            """
+            Shoots every pending segment that has its own start image (does not
+            continue from the previous segment's last frame) at the same time.
+            Results are marked "generated"; each still needs the Producer's approval.
+            """
+            return _dump(self.marty_tools.generate_pending(run_id))
         
         @function_tool
         def mark_approved(segment_index: int, video_path: str = None) -> str:
             """Marks a segment as approved."""
-            return str(self.marty_tools.mark_approved(segment_index, video_path))
+            return _dump(self.marty_tools.mark_approved(segment_index, video_path))
         
         @function_tool
         def create_project(script_json: str, initial_image_url: str = None) -> str:
             """Creates a new project from an approved script."""
-            return str(self.marty_tools.create_project(script_json, initial_image_url))
+            return _dump(self.marty_tools.create_project(script_json, initial_image_url))
         
         @function_tool
         def reset_project() -> str:
             """Resets the session for a new project."""
-            return str(self.marty_tools.reset_project())
+            return _dump(self.marty_tools.reset_project())
         
         self.marty = Agent(
             name="Marty",
@@ -332,6 +358,7 @@ Return ONLY the JSON array."""
             TOOLS (you manage the project):
             - get_status: Check current project state
             - update_manifest: Modify the project
+            - generate_pending: Shoot all independent segments (own start image) at once
             - mark_approved: Lock in a segment
             - create_project: Start a new project from script
             - reset_project: Start fresh
@@ -344,7 +371,9 @@ Return ONLY the JSON array."""
             CRITICAL APPROVAL RULES:
             1. ONLY the exact word "approved" means proceed.
             2. ANY other feedback → Screenwriter rewrites.
-            3. NEVER shoot multiple segments in one go. ONE at a time with approval.
+            3. NEVER shoot multiple segments in one go, EXCEPT segments that have their own
+               start image: those may be shot together with generate_pending. Every
+               segment is still shown to the Producer and approved ONE at a time.
             
             CINEMATOGRAPHER HANDOFF:
             When sending work to Cinematographer, ALWAYS include:
@@ -363,7 +392,7 @@ Return ONLY the JSON array."""
             - After script: "🎬 Script ready! Say 'approved' to start production."
             - After segment: "🎬 Segment X complete! Say 'approved' to lock it in."
             """,
-            tools=[get_status, update_manifest, mark_approved, create_project, reset_project],
+            tools=[get_status, update_manifest, generate_pending, mark_approved, create_project, reset_project],
             handoffs=[self.screenwriter, self.cinematographer, self.editor]
         )
     
@@ -6,26 +6,98 @@ Instead of rigid wrapper tools, it uses one flexible execute_moviepy tool.
 """
 
 import os
-import sys
+import re
 import uuid
+import hashlib
 import tempfile
 import subprocess
+import multiprocessing
 from typing import Dict, Any, List, Optional
 
+from scorsese.services.script_pool import get_script_pool
+from scorsese.services.jsonio import read_json, write_json_atomic
+
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output")
+SCRIPT_TIMEOUT = 300  # 5 min
+# sha256(script) -> {"stdout", "output_files", "inputs"} of its last successful run
+_SCRIPT_CACHE_DIR = os.path.join(OUTPUT_DIR, ".script_cache")
+_SCENE_CLASS_RE = re.compile(r'class\s+(\w+)\s*\(\s*Scene\s*\)')
+_STRING_LITERAL_RE = re.compile(r'''(["'])([^"'\n]+?)\1''')
+
+
+def _input_fingerprints(script_code: str, exclude=()) -> Dict[str, List[int]]:
+    """
+    {abspath: [mtime_ns, size]} for every string literal in the script that
+    names an existing file (relative paths resolve from OUTPUT_DIR, the
+    script's cwd), minus `exclude`. A cached result is only reused while these
+    match, so re-downloaded or re-rendered inputs force a fresh run.
+    """
+    skip = {os.path.abspath(os.path.join(OUTPUT_DIR, p)) for p in exclude}
+    fingerprints = {}
+    for _, literal in _STRING_LITERAL_RE.findall(script_code):
+        path = os.path.abspath(os.path.join(OUTPUT_DIR, literal))
+        if path in skip or path in fingerprints:
+            continue
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            continue
+        if os.path.isfile(path):
+            fingerprints[path] = [st.st_mtime_ns, st.st_size]
+    return fingerprints
+
+
+def _find_scene_video(root: str, scene_name: str, suffix: str = ".mp4") -> Optional[str]:
+    """
+    Depth-first os.scandir search for `<scene_name><suffix>` under `root`.
+    Returns the first hit; DirEntry caches the file type, so there is no extra
+    stat per entry. Manim's partial_movie_files dirs are never the answer.
+    """
+    target = scene_name + suffix
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != "partial_movie_files":
+                            stack.append(entry.path)
+                    elif entry.name == target:
+                        return entry.path
+        except OSError:
+            continue
+    return None
 
 
 class EditorTools:
     """Flexible post-production tools for Editor agent."""
     
+    __slots__ = ("moviepy_service", "music_service", "elevenlabs_service", "manim_service", "_pool")
+    
     def __init__(self, moviepy_service=None, music_service=None, elevenlabs_service=None, manim_service=None):
         self.moviepy_service = moviepy_service
         self.music_service = music_service
         self.elevenlabs_service = elevenlabs_service
         self.manim_service = manim_service
+        self._pool = None
+    
+    @property
+    def pool(self):
+        """Shared pool of warm single-use workers that execute editor scripts."""
+        if self._pool is None:
+            self._pool = get_script_pool()
+        return self._pool
     
     # --- Tool 1: edit_video (MoviePy Expert) ---
-    def edit_video(self, task: str, script_code: str, save_name: str = None) -> Dict[str, Any]:
+    def _save_script(self, save_name: str, script_code: str) -> str:
+        saved_path = os.path.join(OUTPUT_DIR, "saved_scripts", f"{save_name}.py")
+        os.makedirs(os.path.dirname(saved_path), exist_ok=True)
+        with open(saved_path, 'w') as f:
+            f.write(script_code)
+        return saved_path
+    
+    def edit_video(self, task: str, script_code: str, save_name: str = None, cache: bool = True) -> Dict[str, Any]:
         """
         Executes a MoviePy script written by the Editor agent.
         
@@ -36,6 +108,9 @@ class EditorTools:
             script_code: Complete Python script using MoviePy v2 syntax.
                         MUST use: from moviepy import ... (NOT from moviepy.editor)
             save_name: Optional name to save script for reuse.
+            cache: Reuse the result of an identical earlier script whose output
+                   files still exist and whose input files are unchanged
+                   (same mtime and size). Pass False for non-deterministic scripts.
             
         Returns:
             Dict with stdout, stderr, and output file paths found.
@@ -47,6 +122,31 @@ class EditorTools:
             - Use `with_position(pos)` not `set_position`
             - TextClip needs explicit font path or "Arial"
         """
+        # Identical script already rendered from the same inputs, outputs still on disk?
+        script_hash = hashlib.sha256(script_code.encode("utf-8")).hexdigest()
+        cache_path = os.path.join(_SCRIPT_CACHE_DIR, f"{script_hash}.json")
+        if cache:
+            try:
+                cached = read_json(cache_path)
+            except (OSError, ValueError):
+                cached = None
+            if (cached and all(os.path.exists(p) for p in cached["output_files"])
+                    and cached.get("inputs") == _input_fingerprints(script_code, cached["output_files"])):
+                output = {
+                    "task": task,
+                    "success": True,
+                    "cached": True,
+                    "stdout": cached["stdout"],
+                    "stderr": "",
+                    "return_code": 0,
+                    "output_files": cached["output_files"]
+                }
+                if save_name:
+                    output["saved_to"] = self._save_script(save_name, script_code)
+                return output
+        
+        inputs = _input_fingerprints(script_code)
+        
         # Create a temp script file
         temp_script_path = os.path.join(OUTPUT_DIR, f"editor_script_{uuid.uuid4().hex[:6]}.py")
         os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -54,41 +154,44 @@ class EditorTools:
         with open(temp_script_path, 'w') as f:
             f.write(script_code)
         
-        # Run the script
+        # Run the script in a warm worker (moviepy already imported there)
         try:
-            result = subprocess.run(
-                [sys.executable, temp_script_path],
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 min timeout
-                cwd=OUTPUT_DIR
-            )
+            try:
+                result = self.pool.run(script_code, temp_script_path, OUTPUT_DIR, SCRIPT_TIMEOUT)
+            except multiprocessing.TimeoutError:
+                return {
+                    "task": task,
+                    "success": False,
+                    "error": "Script execution timed out (5 minutes)",
+                    "script_path": temp_script_path
+                }
             
             output = {
                 "task": task,
-                "success": result.returncode == 0,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "return_code": result.returncode
+                "success": result["returncode"] == 0,
+                "stdout": result["stdout"],
+                "stderr": result["stderr"],
+                "return_code": result["returncode"]
             }
             
-            # Try to find output files mentioned in stdout
-            import re
-            paths_found = re.findall(r'[A-Za-z]:\\[^\s"\']+\.(?:mp4|avi|mov|mp3|wav|png|jpg)', result.stdout)
-            paths_found += re.findall(r'/[^\s"\']+\.(?:mp4|avi|mov|mp3|wav|png|jpg)', result.stdout)
+            # Output files mentioned in stdout (collected while the script ran)
+            paths_found = result["output_files"]
             if paths_found:
                 output["output_files"] = paths_found
+                # Only scripts with known outputs can be validated on a later hit
+                if result["returncode"] == 0:
+                    outputs = {os.path.abspath(os.path.join(OUTPUT_DIR, p)) for p in paths_found}
+                    inputs = {p: v for p, v in inputs.items() if p not in outputs}
+                    os.makedirs(_SCRIPT_CACHE_DIR, exist_ok=True)
+                    write_json_atomic(cache_path, {"stdout": result["stdout"], "output_files": paths_found,
+                                                   "inputs": inputs})
             
             # Save script if requested
-            if save_name and result.returncode == 0:
-                saved_path = os.path.join(OUTPUT_DIR, "saved_scripts", f"{save_name}.py")
-                os.makedirs(os.path.dirname(saved_path), exist_ok=True)
-                with open(saved_path, 'w') as f:
-                    f.write(script_code)
-                output["saved_to"] = saved_path
+            if save_name and result["returncode"] == 0:
+                output["saved_to"] = self._save_script(save_name, script_code)
             
             # Cleanup temp script on success
-            if result.returncode == 0:
+            if result["returncode"] == 0:
                 os.remove(temp_script_path)
             else:
                 output["script_path"] = temp_script_path
@@ -96,13 +199,6 @@ class EditorTools:
             
             return output
             
-        except subprocess.TimeoutExpired:
-            return {
-                "task": task,
-                "success": False,
-                "error": "Script execution timed out (5 minutes)",
-                "script_path": temp_script_path
-            }
         except Exception as e:
             return {
                 "task": task,
@@ -136,34 +232,34 @@ class EditorTools:
         if not script_code:
             return {"success": False, "error": "No Manim script provided"}
         
+        # Find the Scene class name
+        scene_match = _SCENE_CLASS_RE.search(script_code)
+        if not scene_match:
+            return {"success": False, "error": "No Scene class found in script"}
+        
+        scene_name = scene_match.group(1)
+        
+        service_error = None
         if self.manim_service:
-            # Use existing manim service if available
+            # Use existing manim service if available (it manages its own temp script)
             try:
-                result = self.manim_service.render_scene_from_code(script_code)
+                result = self.manim_service.render_scene(script_code, scene_name)
                 return {
                     "success": True,
                     "description": description,
                     "output_path": result
                 }
             except Exception as e:
-                return {"success": False, "error": str(e)}
+                service_error = str(e)
         
         # Fallback: run Manim directly
         temp_script_path = os.path.join(OUTPUT_DIR, f"manim_script_{uuid.uuid4().hex[:6]}.py")
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         
-        with open(temp_script_path, 'w') as f:
-            f.write(script_code)
-        
-        # Find the Scene class name
-        import re
-        scene_match = re.search(r'class\s+(\w+)\s*\(\s*Scene\s*\)', script_code)
-        if not scene_match:
-            return {"success": False, "error": "No Scene class found in script"}
-        
-        scene_name = scene_match.group(1)
-        
         try:
+            with open(temp_script_path, 'w') as f:
+                f.write(script_code)
+            
             result = subprocess.run(
                 ["manim", "-ql", temp_script_path, scene_name],
                 capture_output=True,
@@ -174,22 +270,31 @@ class EditorTools:
             
             if result.returncode == 0:
                 # Find output video
-                video_pattern = re.compile(rf'{scene_name}\.mp4')
-                for root, dirs, files in os.walk(os.path.join(OUTPUT_DIR, "media")):
-                    for f in files:
-                        if video_pattern.search(f):
-                            video_path = os.path.join(root, f)
-                            return {
-                                "success": True,
-                                "description": description,
-                                "output_path": video_path
-                            }
+                # Manim writes to media/videos/<script name>/<quality>/<Scene>.mp4;
+                # the temp script name is unique, so its dir holds only this render
+                script_stem = os.path.splitext(os.path.basename(temp_script_path))[0]
+                video_path = _find_scene_video(os.path.join(OUTPUT_DIR, "media", "videos", script_stem), scene_name)
+                if video_path:
+                    return {
+                        "success": True,
+                        "description": description,
+                        "output_path": video_path
+                    }
                 return {"success": True, "description": description, "stdout": result.stdout}
             else:
-                return {"success": False, "error": result.stderr}
-                
+                error = result.stderr
         except Exception as e:
-            return {"success": False, "error": str(e)}
+            error = str(e)
+        finally:
+            # The render (if any) lives under media/; the script is not needed
+            try:
+                os.unlink(temp_script_path)
+            except OSError:
+                pass
+        
+        if service_error:
+            error = f"Manim service failed: {service_error}\nDirect render failed: {error}"
+        return {"success": False, "error": error}
     
     # --- Tool 3: generate_music (Suno) ---
     def generate_music(self, prompt: str, instrumental: bool = True) -> Dict[str, Any]:
@@ -6,16 +6,132 @@ He manages the manifest, routes work to specialists, and keeps production on tra
 """
 
 import os
-import json
-from typing import Dict, Any, List, Optional
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
+
+from scorsese.services.jsonio import loads, read_json, write_json_atomic
 
 # Output directory for manifests
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output")
+_MANIFEST_PATH_FMT = os.path.join(OUTPUT_DIR, "manifest_{}.json").format
+
+# Parsed manifests keyed by path -> (st_mtime_ns, manifest). Treat entries as
+# read-only; callers that mutate must deepcopy first.
+_MANIFEST_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+_CACHE_LOCK = threading.RLock()
+
+
+def _load_manifest(path: str) -> Optional[Dict[str, Any]]:
+    """Returns the parsed manifest at `path` (None if missing), re-reading only when its mtime changes."""
+    with _CACHE_LOCK:
+        cached = _MANIFEST_CACHE.get(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            _MANIFEST_CACHE.pop(path, None)
+            return None
+        if cached and cached[0] == mtime:
+            return cached[1]
+        manifest = read_json(path)
+        _MANIFEST_CACHE[path] = (mtime, manifest)
+        return manifest
+
+
+def _save_manifest(path: str, manifest: Dict[str, Any]):
+    """Atomically writes the manifest and caches it under its new mtime."""
+    with _CACHE_LOCK:
+        write_json_atomic(path, manifest)
+        _MANIFEST_CACHE[path] = (os.stat(path).st_mtime_ns, manifest)
+
+
+# --- update_manifest actions ---
+# Each mutates `segments` in place and logs to `results`. Deletes only add the
+# segment to `deleted` (by identity); update_manifest drops tombstoned segments
+# and renumbers once after the whole batch, so every index in a batch refers
+# to the segment positions at the start of the call.
+
+def _live(segments, idx, deleted):
+    """The segment at 0-based `idx`, or None if out of range or already deleted."""
+    if 0 <= idx < len(segments) and id(segments[idx]) not in deleted:
+        return segments[idx]
+    return None
+
+
+def _mod_update_prompt(segments, mod, results, deleted):
+    idx = mod.get("index", 0) - 1  # Convert to 0-based
+    seg = _live(segments, idx, deleted)
+    if seg is not None:
+        seg["prompt"] = mod.get("prompt", seg.get("prompt"))
+        results.append(f"Updated prompt for segment {idx+1}")
+
+
+def _mod_update_image(segments, mod, results, deleted):
+    idx = mod.get("index", 0) - 1
+    seg = _live(segments, idx, deleted)
+    if seg is not None:
+        seg.setdefault("metadata", {})["input_image"] = mod.get("image_url")
+        results.append(f"Updated input image for segment {idx+1}")
+
+
+def _mod_swap(segments, mod, results, deleted):
+    idx_a = mod.get("index_a", 0) - 1
+    idx_b = mod.get("index_b", 0) - 1
+    if _live(segments, idx_a, deleted) is not None and _live(segments, idx_b, deleted) is not None:
+        segments[idx_a], segments[idx_b] = segments[idx_b], segments[idx_a]
+        results.append(f"Swapped segments {idx_a+1} and {idx_b+1}")
+
+
+def _mod_delete(segments, mod, results, deleted):
+    idx = mod.get("index", 0) - 1
+    seg = _live(segments, idx, deleted)
+    if seg is not None:
+        deleted.add(id(seg))
+        results.append(f"Deleted segment {idx+1}")
+
+
+def _mod_set_status(segments, mod, results, deleted):
+    idx = mod.get("index", 0) - 1
+    seg = _live(segments, idx, deleted)
+    if seg is not None:
+        seg["status"] = mod.get("status", "pending")
+        if mod.get("notes"):
+            seg.setdefault("metadata", {})["notes"] = mod.get("notes")
+        if mod.get("video_path"):
+            seg["video_path"] = mod["video_path"]
+        if mod.get("video_url"):
+            seg["video_url"] = mod["video_url"]
+        results.append(f"Set segment {idx+1} status to {mod.get('status')}")
+
+
+def _mod_add(segments, mod, results, deleted):
+    segments.append({
+        "index": len(segments) + 1,  # final number assigned by the renumber pass
+        "prompt": mod.get("prompt", ""),
+        "status": "pending",
+        "video_path": None,
+        "video_url": None,
+        "metadata": mod.get("metadata", {})
+    })
+    results.append(f"Added segment {len(segments) - len(deleted)}")
+
+
+_ACTION_HANDLERS = {
+    "update_prompt": _mod_update_prompt,
+    "update_image": _mod_update_image,
+    "swap": _mod_swap,
+    "delete": _mod_delete,
+    "set_status": _mod_set_status,
+    "add": _mod_add,
+}
 
 
 class MartyTools:
     """Consolidated workflow tools for Marty (Director) agent."""
     
+    __slots__ = ("session_state", "video_service", "pipeline_service")
+    
     def __init__(self, session_state=None, video_service=None, pipeline_service=None):
         self.session_state = session_state
         self.video_service = video_service
@@ -45,32 +161,32 @@ class MartyTools:
             }
         
         # Load manifest
-        manifest_path = os.path.join(OUTPUT_DIR, f"manifest_{target_run}.json")
-        if not os.path.exists(manifest_path):
+        manifest_path = _MANIFEST_PATH_FMT(target_run)
+        manifest = _load_manifest(manifest_path)
+        if manifest is None:
             return {
                 "status": "not_found",
                 "message": f"Manifest {target_run} not found.",
                 "next_action": "create_project"
             }
         
-        with open(manifest_path, 'r') as f:
-            manifest = json.load(f)
-        
         # Analyze segments
         segments = manifest.get("segments", [])
         total = len(segments)
-        approved = sum(1 for s in segments if s.get("status") == "approved")
-        pending = sum(1 for s in segments if s.get("status") == "pending")
-        generating = sum(1 for s in segments if s.get("status") == "generating")
-        failed = sum(1 for s in segments if s.get("status") == "failed")
+        counts = {"approved": 0, "pending": 0, "generating": 0, "failed": 0}
+        next_pending_idx = None
+        for i, seg in enumerate(segments):
+            st = seg.get("status")
+            counts[st] = counts.get(st, 0) + 1
+            if st == "pending" and next_pending_idx is None:
+                next_pending_idx = i + 1
         
         # Determine next action
-        if pending > 0:
-            next_pending_idx = next((i+1 for i, s in enumerate(segments) if s.get("status") == "pending"), None)
+        if next_pending_idx is not None:
             next_action = f"generate_segment_{next_pending_idx}"
-        elif generating > 0:
+        elif counts["generating"] > 0:
             next_action = "wait_for_generation"
-        elif approved == total and total > 0:
+        elif counts["approved"] == total and total > 0:
             next_action = "stitch_final"
         else:
             next_action = "review_segments"
@@ -86,10 +202,10 @@ class MartyTools:
             "manifest_path": manifest_path,
             "segments": {
                 "total": total,
-                "approved": approved,
-                "pending": pending,
-                "generating": generating,
-                "failed": failed
+                "approved": counts["approved"],
+                "pending": counts["pending"],
+                "generating": counts["generating"],
+                "failed": counts["failed"]
             },
             "segment_details": segments,
             "locked_script": locked_script is not None,
@@ -100,87 +216,44 @@ class MartyTools:
     # --- Tool 2: update_manifest ---
     def update_manifest(self, run_id: str, modifications: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Modifies the project manifest.
+        Modifies the project manifest. The change is on disk when this returns.
         
         Args:
             run_id: The run ID to modify.
             modifications: List of modification dicts, each with:
                 - action: "update_prompt" | "update_image" | "swap" | "delete" | "add" | "set_status"
-                - index: Segment index (1-based)
+                - index: Segment index (1-based, as numbered before this call;
+                  deletes are applied after the whole list)
+                - set_status also accepts optional video_path / video_url
                 - ... action-specific fields
                 
         Returns:
             Result of the modifications.
         """
-        manifest_path = os.path.join(OUTPUT_DIR, f"manifest_{run_id}.json")
-        if not os.path.exists(manifest_path):
+        manifest_path = _MANIFEST_PATH_FMT(run_id)
+        cached = _load_manifest(manifest_path)
+        if cached is None:
             return {"success": False, "error": f"Manifest {run_id} not found"}
-        
-        with open(manifest_path, 'r') as f:
-            manifest = json.load(f)
+        manifest = copy.deepcopy(cached)
         
         results = []
         segments = manifest.get("segments", [])
         
+        deleted = set()
         for mod in modifications:
-            action = mod.get("action")
-            idx = mod.get("index", 0) - 1  # Convert to 0-based
-            
-            if action == "update_prompt":
-                if 0 <= idx < len(segments):
-                    segments[idx]["prompt"] = mod.get("prompt", segments[idx].get("prompt"))
-                    results.append(f"Updated prompt for segment {idx+1}")
-                    
-            elif action == "update_image":
-                if 0 <= idx < len(segments):
-                    if "metadata" not in segments[idx]:
-                        segments[idx]["metadata"] = {}
-                    segments[idx]["metadata"]["input_image"] = mod.get("image_url")
-                    results.append(f"Updated input image for segment {idx+1}")
-                    
-            elif action == "swap":
-                idx_a = mod.get("index_a", 0) - 1
-                idx_b = mod.get("index_b", 0) - 1
-                if 0 <= idx_a < len(segments) and 0 <= idx_b < len(segments):
-                    segments[idx_a], segments[idx_b] = segments[idx_b], segments[idx_a]
-                    # Update indices
-                    segments[idx_a]["index"] = idx_a + 1
-                    segments[idx_b]["index"] = idx_b + 1
-                    results.append(f"Swapped segments {idx_a+1} and {idx_b+1}")
-                    
-            elif action == "delete":
-                if 0 <= idx < len(segments):
-                    deleted = segments.pop(idx)
-                    # Re-index remaining
-                    for i, seg in enumerate(segments):
-                        seg["index"] = i + 1
-                    results.append(f"Deleted segment {idx+1}")
-                    
-            elif action == "set_status":
-                if 0 <= idx < len(segments):
-                    segments[idx]["status"] = mod.get("status", "pending")
-                    if mod.get("notes"):
-                        if "metadata" not in segments[idx]:
-                            segments[idx]["metadata"] = {}
-                        segments[idx]["metadata"]["notes"] = mod.get("notes")
-                    results.append(f"Set segment {idx+1} status to {mod.get('status')}")
-                    
-            elif action == "add":
-                new_segment = {
-                    "index": len(segments) + 1,
-                    "prompt": mod.get("prompt", ""),
-                    "status": "pending",
-                    "video_path": None,
-                    "video_url": None,
-                    "metadata": mod.get("metadata", {})
-                }
-                segments.append(new_segment)
-                results.append(f"Added segment {len(segments)}")
+            handler = _ACTION_HANDLERS.get(mod.get("action"))
+            if handler:
+                handler(segments, mod, results, deleted)
+        
+        # Drop deleted segments and renumber once for the whole batch
+        if deleted:
+            segments = [seg for seg in segments if id(seg) not in deleted]
+        for i, seg in enumerate(segments):
+            seg["index"] = i + 1
         
         # Save updated manifest
         manifest["segments"] = segments
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        _save_manifest(manifest_path, manifest)
         
         return {
             "success": True,
@@ -189,6 +262,94 @@ class MartyTools:
             "total_segments": len(segments)
         }
     
+    def generate_pending(self, run_id: str = None, max_workers: int = None, flush_every: int = 4) -> Dict[str, Any]:
+        """
+        Generates every independent pending segment concurrently.
+        
+        Segments whose metadata has a `depends_on` (they continue from the
+        previous segment's last frame) are left for the one-at-a-time flow.
+        Finished segments are marked "generated" (the Producer still approves
+        them) or "failed"; status writes are batched every `flush_every`
+        completions. Segments that never report back are reset to "pending".
+        
+        Args:
+            run_id: Run to process. If None, uses current session run.
+            max_workers: Concurrent generations (default: cpu_count - 1).
+            flush_every: Completions per manifest write.
+            
+        Returns:
+            Per-segment results and the updated project status.
+        """
+        if not self.video_service:
+            return {"success": False, "error": "Video service not available"}
+        
+        run_id = run_id or (self.session_state.current_run_id if self.session_state else None)
+        if not run_id:
+            return {"success": False, "error": "No active run"}
+        
+        manifest = _load_manifest(_MANIFEST_PATH_FMT(run_id))
+        if manifest is None:
+            return {"success": False, "error": f"Manifest {run_id} not found"}
+        
+        todo = [
+            seg for seg in manifest.get("segments", [])
+            if seg.get("status") == "pending" and (seg.get("metadata") or {}).get("depends_on") is None
+        ]
+        if not todo:
+            return {"success": True, "run_id": run_id, "generated": {}, "message": "No independent pending segments"}
+        
+        self.update_manifest(run_id, [
+            {"action": "set_status", "index": seg["index"], "status": "generating"} for seg in todo
+        ])
+        
+        def _generate(seg):
+            meta = seg.get("metadata") or {}
+            return self.video_service.generate_segment(seg["prompt"], meta.get("mode", "normal"), meta.get("input_image"))
+        
+        # Generation is remote (KIE) and I/O-bound, so threads are enough
+        workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        results, pending_mods = {}, []
+        try:
+            with ThreadPoolExecutor(max_workers=min(workers, len(todo))) as ex:
+                futures = {ex.submit(_generate, seg): seg["index"] for seg in todo}
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    try:
+                        result_str = future.result()
+                    except Exception as e:
+                        result_str = f"Error: {e}"
+                    results[idx] = result_str
+                    
+                    mod = {"action": "set_status", "index": idx, "status": "failed"}
+                    if "SUCCESS" in result_str and "Video generated: " in result_str:
+                        mod["status"] = "generated"
+                        mod["video_url"] = result_str.split("Video generated: ")[1].split("\n")[0].strip()
+                        if "Saved locally: " in result_str:
+                            mod["video_path"] = result_str.split("Saved locally: ")[1].strip()
+                    pending_mods.append(mod)
+                    
+                    if len(pending_mods) >= flush_every:
+                        self.update_manifest(run_id, pending_mods)
+                        pending_mods = []
+        finally:
+            # Anything that never reported back must not stay "generating",
+            # or get_status would never offer it again
+            pending_mods.extend(
+                {"action": "set_status", "index": seg["index"], "status": "pending"}
+                for seg in todo if seg["index"] not in results
+            )
+            if pending_mods:
+                self.update_manifest(run_id, pending_mods)
+        
+        status = self.get_status(run_id)
+        return {
+            "success": True,
+            "run_id": run_id,
+            "generated": results,
+            "project_status": status["segments"],
+            "next_action": status["next_action"]
+        }
+    
     # --- Tool 3: mark_approved ---
     def mark_approved(self, segment_index: int, video_path: str = None) -> Dict[str, Any]:
         """
@@ -211,24 +372,16 @@ class MartyTools:
         # Update session state
         self.session_state.approved_segments[segment_index] = video_path
         
-        # Update manifest
+        # Update manifest (status, notes and video_path in one write, on
+        # disk before we report success)
         result = self.update_manifest(run_id, [{
             "action": "set_status",
             "index": segment_index,
             "status": "approved",
-            "notes": f"Approved at session, path: {video_path}"
+            "notes": f"Approved at session, path: {video_path}",
+            "video_path": video_path
         }])
         
-        if video_path:
-            # Also update video_path in manifest
-            manifest_path = os.path.join(OUTPUT_DIR, f"manifest_{run_id}.json")
-            with open(manifest_path, 'r') as f:
-                manifest = json.load(f)
-            if 0 <= segment_index - 1 < len(manifest["segments"]):
-                manifest["segments"][segment_index - 1]["video_path"] = video_path
-                with open(manifest_path, 'w') as f:
-                    json.dump(manifest, f, indent=2)
-        
         # Get status to determine next action
         status = self.get_status(run_id)
         
@@ -241,12 +394,13 @@ class MartyTools:
         }
     
     # --- Tool 4: create_project ---
-    def create_project(self, script_json: str, initial_image_url: str = None) -> Dict[str, Any]:
+    def create_project(self, script_json: Any, initial_image_url: str = None) -> Dict[str, Any]:
         """
         Creates a new project from an approved script.
         
         Args:
-            script_json: JSON string of the approved script (segments with prompts)
+            script_json: The approved script (segments with prompts), as a JSON
+                         string or an already-parsed list/dict
             initial_image_url: Optional starting image URL
             
         Returns:
@@ -259,8 +413,8 @@ class MartyTools:
         
         # Parse script
         try:
-            script = json.loads(script_json) if isinstance(script_json, str) else script_json
-        except json.JSONDecodeError:
+            script = loads(script_json) if isinstance(script_json, (str, bytes, bytearray)) else script_json
+        except ValueError:
             return {"success": False, "error": "Invalid script JSON"}
         
         # Build manifest
@@ -274,6 +428,9 @@ class MartyTools:
         
         for i, seg in enumerate(segment_list):
             prompt = seg.get("prompt") or seg.get("visual") or str(seg)
+            # Segments with their own start image are independent shots; the
+            # rest continue from the previous segment's last frame
+            image = initial_image_url if i == 0 else (seg.get("image_url") or seg.get("input_image"))
             segments.append({
                 "index": i + 1,
                 "prompt": prompt,
@@ -282,7 +439,8 @@ class MartyTools:
                 "video_url": None,
                 "metadata": {
                     "mode": seg.get("mode", "normal"),
-                    "input_image": initial_image_url if i == 0 else None
+                    "input_image": image,
+                    "depends_on": None if (i == 0 or image) else i
                 }
             })
         
@@ -294,14 +452,14 @@ class MartyTools:
         
         # Save manifest
         os.makedirs(OUTPUT_DIR, exist_ok=True)
-        manifest_path = os.path.join(OUTPUT_DIR, f"manifest_{run_id}.json")
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        manifest_path = _MANIFEST_PATH_FMT(run_id)
+        _save_manifest(manifest_path, manifest)
         
         # Update session
         if self.session_state:
             self.session_state.current_run_id = run_id
-            self.session_state.locked_script = script_json
+            # Keep the parsed form; SessionState serializes on demand
+            self.session_state.locked_script = script
         
         return {
             "success": True,
@@ -1,10 +1,18 @@
 import os
 import json
 import asyncio
-from typing import Any, Dict
+import re
+import random
+import shutil
+import hashlib
+import functools
+import tempfile
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 from scorsese.services.kie_client import KIEClient
-from scorsese.services.llm_client import LLMClient
-from scorsese.models import ViralScript
+from scorsese.services.llm_client import LLMClient, build_http_client
+from scorsese.models import ViralScript, SegmentSpec
 from scorsese.services.moviepy_service import MoviePyService
 from scorsese.services.image_upload_service import ImageUploadService
 from scorsese.services.music_service import MusicService
@@ -12,6 +20,15 @@ from scorsese.services.elevenlabs_service import ElevenLabsService
 from scorsese.services.manim_service import ManimService
 from scorsese.services.video_service import VideoService
 from scorsese.services.pipeline_service import PipelineService
+from scorsese.services.http_session import HTTP_TIMEOUT, DOWNLOAD_CHUNK, open_download, download_file
+from scorsese.services.ttl_cache import TTLCache, cache_key
+from scorsese.services.jsonio import loads
+from scorsese.services import ffmpeg_tools
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
 try:
     from agents import Agent, Runner, function_tool
@@ -24,6 +41,398 @@ except ImportError:
     def function_tool(f): return f
 
 
+# The guide ships at the repository root (two levels above this package module)
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+GUIDE_PATH = os.environ.get("SCORSESE_GUIDE_PATH") or os.path.join(_REPO_ROOT, "AI Guide to Viral TikTok Scripts.txt")
+GUIDE_MAX_CHARS = 15000
+_GUIDE_FALLBACK = "Use viral marketing principles."
+WRITER_BATCH_WORKERS = 8
+WRITER_CACHE_TTL = 6 * 3600  # identical writer briefs reuse the draft for a while
+KIE_CONCURRENCY = 4  # simultaneous KIE generations for independent clips
+VOICE_CONCURRENCY = 3  # simultaneous voice changes (KIE isolate + ElevenLabs rate limits)
+OUTPUT_DIR = os.path.join(os.getcwd(), "scorsese", "output")
+# KIE-isolated voice tracks, keyed by a hash of the extracted audio
+KIE_AUDIO_CACHE_DIR = os.path.join(os.getcwd(), "scorsese", "cache", "kie_audio")
+KIE_AUDIO_CACHE_MAX_BYTES = 5 * 1024 ** 3
+
+_RAND = random.SystemRandom()
+_IO_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="guide")
+# Markdown code-fence lines (```, ```python, ``` py, ...) around LLM-written code
+_MD_FENCE = re.compile(r"^[ \t]*```[ \t]*[\w+-]*[ \t]*$\n?", re.MULTILINE)
+
+
+def _short_id() -> str:
+    """6 hex chars for unique-enough temp/output file names."""
+    return f"{_RAND.getrandbits(24):06x}"
+
+
+def _new_path(directory: str, prefix: str, suffix: str = ".mp4") -> str:
+    """A fresh `<prefix>_<short id><suffix>` path in `directory`."""
+    return os.path.join(directory, f"{prefix}_{_short_id()}{suffix}")
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _find_cached(directory: str, stem: str):
+    """Path of the `<stem>.<ext>` file in `directory`, whatever its extension, or None."""
+    prefix = stem + "."
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.startswith(prefix) and entry.is_file():
+                    return entry.path
+    except OSError:
+        pass
+    return None
+
+
+def _prune_cache_dir(directory: str, max_bytes: int):
+    """Deletes least recently used files (by mtime) until `directory` fits in `max_bytes`."""
+    try:
+        entries = [e for e in os.scandir(directory) if e.is_file()]
+    except OSError:
+        return
+    files = sorted((e.stat().st_mtime, e.stat().st_size, e.path) for e in entries)
+    total = sum(size for _, size, _ in files)
+    for _, size, path in files:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+# System prompt for consult_expert_writer; {guide} is the guide prefix.
+_DRAFTER_SYS_TMPL = """
+You are a Viral Content Strategist & Video Prompt Engineer.
+
+GOAL: Write a TikTok script based on the guide:
+{guide}
+
+CRITICAL: For the 'visual' field of each segment, you MUST use "Structural Prompting" for high-fidelity AI generation.
+Format visual descriptions as:
+"Subject: [Description of the character/object]. Action: [Precise movement vectors, MUST INCLUDE 'speaking to camera' if there is dialogue]. Environment: [Lighting/Context]. Technical: [Camera angle/fps]."
+
+RULES FOR VISUALS:
+1. SUBJECT: MUST be generic to match the input image (e.g., "The character in the image", "The speaker"). DO NOT invent gender/clothing details (e.g., "Male trader in hoodie") as this causes morphing artifacts if it conflicts with the user's image.
+2. NO TEXT: Do NOT include requests for "Text Overlay", "Captions", or "UI elements" in the visual description. The video should be clean.
+3. LIP SYNC MANDATORY: If the character speaks, the Action MUST explicitly say: "The character is speaking to the camera. Mouth moving in sync with speech."
+4. NO NARRATION: Do NOT describe the scene as a "documentary" or "b-roll". The character MUST be present and acting.
+
+Example Visual:
+"Subject: The character in the image. Action: Speaking directly to the camera with an excited expression, leaning in. Mouth moving. Environment: A neon-lit room. Technical: Low angle, 24fps. No text."
+
+PRIORITY: Focus on MOTIVATED CAMERA MOVEMENT (whip pans, zooms) and EXPRESSIVE FACIAL ACTIONS.
+AVOID: Excessive VFX (confetti, explosions) or "busy" elements unless the script demands it.
+
+JSON STRUCTURE REQUIREMENTS:
+1. Fields: 'visual', 'spoken', 'text_overlay', 'music', 'sound_effects'.
+2. SPOKEN TEXT: MUST be spoken naturally. NEVER put raw URLs, wallet hashes, or code snippets in the 'spoken' field (the AI cannot read them). Use "Link in bio" or "Address on screen".
+3. TEXT OVERLAY: Put all on-screen text HERE, not in 'visual'.
+
+Return a valid JSON structure (ViralScript schema).
+Ensure segments are <6 seconds.
+
+CRITICAL CONSTRAINT ADHERENCE:
+- If the user asks for "one segment", "single segment", or "extending the last segment", you MUST output EXACTLY ONE segment in the JSON list.
+- Do not generate Intro/Outro segments unless explicitly requested.
+- Do not ignore the user's explicit request for brevity.
+- If "Extending", the context is implied (continuation), so start immediately (no "Hey guys!" intro).
+"""
+
+
+_RENDERED_PROMPTS: Dict[str, str] = {}
+
+
+def _render(name: str, template: str, guide: str) -> str:
+    """Formats a {guide} template once per process; later instances reuse it."""
+    rendered = _RENDERED_PROMPTS.get(name)
+    if rendered is None:
+        rendered = _RENDERED_PROMPTS[name] = template.format(guide=guide)
+    return rendered
+
+
+# --- Agent instructions ---
+
+_DRAFTER_INSTRUCTIONS = """
+You are the SCRIPT DEPARTMENT for Martin Scorsese's viral video production studio.
+
+YOUR MISSION: Draft scripts that will become legendary content.
+
+PERSONALITY:
+- You're working for a legendary director who demands excellence
+- Be confident, creative, and efficient
+- After drafting, PUSH the user towards the next step
+
+WORKFLOW:
+1. Call `consult_expert_writer` with the user's idea.
+   If the user gives more than 3 separate topics, call `consult_expert_writer_batch` once with all of them instead.
+2. Present the script cleanly.
+3. ALWAYS end with a call to action like:
+   "🎬 The script is ready, boss! Say **'approved'** and we'll start rolling cameras on Segment 1."
+   OR
+   "Ready when you are! Just say **'produce it'** or **'approved'** to begin production."
+
+RULES:
+1. You DO NOT write scripts yourself. Call the tool.
+2. Do not ask for more info - just call the tool with what you have.
+3. ALWAYS suggest the next step after presenting the script.
+"""
+
+_PRODUCER_INSTRUCTIONS = """
+You are the EXECUTIVE PRODUCER for Scorsese's viral video studio.
+
+🎬 THE VISION: You're making FILMS, not just clips. Every project follows this pipeline:
+
+PRODUCTION PIPELINE:
+1. 📝 SCRIPT → Get approved script from Drafter
+2. 🎥 SEGMENT 1 → Generate, show to director for approval
+3. 🎥 SEGMENT 2 → Generate using last frame continuity
+4. ... (repeat for all segments)
+5. 🎞️ STITCH → Combine all approved segments
+6. 🎬 FINAL CUT → Deliver the masterpiece
+
+YOUR PERSONALITY:
+- You're working for SCORSESE. Mediocrity is not an option.
+- Be PROACTIVE. After each step, suggest the next one.
+- Keep momentum. The director wants to see this FINISHED.
+- Celebrate wins: "Segment 1 is looking FIRE 🔥 Ready for Segment 2?"
+
+AFTER EVERY ACTION, suggest next step:
+- After segment generation: "Segment X complete! Say **'approved'** to lock it in, or **'retry'** to try again."
+- After approval: "Locked! Ready to roll on Segment Y? Say **'next'** or **'generate segment Y'**."
+- After final segment: "All segments done! Say **'stitch'** to create the final cut!"
+- After stitching: "🎬 THE FILM IS COMPLETE! Your masterpiece awaits."
+
+## APPROVAL HANDLING (PRIORITY)
+
+⚠️ CRITICAL RULE: ONE SEGMENT PER TURN ⚠️
+- After generating ANY segment, you MUST STOP and wait for user approval.
+- NEVER generate Segment 2 immediately after Segment 1 in a single turn.
+- NEVER call `run_daisychain_pipeline` if an active run already exists.
+- ALWAYS ask "Ready for Segment N?" and WAIT for user response.
+
+When user says "approved", "looks good", "I like it", "nice", etc.:
+
+1. FIRST: Call `get_session_status()` to see current state.
+2. IF no active run exists:
+   - The user approved a SCRIPT draft from the Drafter.
+   - Call `lock_script(script_json)` with the script from the conversation.
+   - Then call `run_daisychain_pipeline(...)` to start production (generates Segment 1 ONLY).
+   - Immediately call `set_current_run(run_id)` with the returned run_id.
+   - ⛔ STOP HERE. Tell them: "🎬 Segment 1 is ready! Say **'approved'** to lock it in and continue to Segment 2."
+   - DO NOT auto-generate Segment 2. WAIT for user.
+3. IF an active run exists:
+   - The user approved a generated SEGMENT.
+   - Call `approve_segment(segment_index, video_path)`.
+   - Check if more segments remain:
+     - If YES: Ask "🎬 Locked! Ready to roll on Segment N? Say **'next'** or **'approved'** to generate it."
+     - ⛔ DO NOT auto-generate. WAIT for user to say "next" or "approved" again.
+     - If all done: "🎬 All segments approved! Say **'stitch'** for the final cut!"
+
+When user says "next", "continue", "generate segment N":
+- Call `process_pipeline_manifest(run_id, steps=1)` to generate the NEXT pending segment.
+- ⛔ STOP after generation. Ask for approval again.
+
+When user says "retry", "again", "try again":
+- Call `resume_pipeline_run(from_segment=N)` where N is the segment to retry.
+- Do NOT create a new run!
+
+CRITICAL INSTRUCTIONS:
+1. For each segment, construct a prompt appropriate to the content type:
+   - **TALKING HEAD** (character speaks to camera): 
+     Format: "Using the attached image as reference, animate the character speaking. The character says: '{spoken}'. {visual_description}"
+   - **ACTION/SCENE** (no dialogue, just motion):
+     Format: "Using the attached image as reference, animate: {action_description}. {visual_details}"
+   - **PRODUCT/OBJECT** (showing something):
+     Format: "Using the attached image as reference, animate the scene: {description}"
+   - Use descriptive terms that match the content (e.g., "lip-sync" only if there's dialogue).
+4. EXECUTION STRATEGY:
+   - **GOLDEN RULE**: If the video has multiple segments that tell a STORY (Seg 1 -> Seg 2), you **MUST** use `run_daisychain_pipeline`.
+     -> This handles the "Seg 1 Last Frame -> Seg 2 Input" continuity automatically.
+     -> Do NOT try to manually call `generate_video_segment` for sequential parts. You will break the visual continuity.
+
+   - **"MANUAL DAISYCHAIN"**: This just means running the `run_daisychain_pipeline` (which generates segments) and then letting the user stitch them later.
+     -> So, if user says "manual daisychain", CALL `run_daisychain_pipeline`.
+
+   - **TRUE MANUAL / DEBUG**: Only use `generate_video_segment` singly if:
+     a. The user explicitly asks to "regenerate segment X" (fixing a mistake).
+     b. You are strictly debugging.
+
+   - **INDEPENDENT CLIPS / "BUCKSHOT"** (no continuity): call `run_parallel_segments(segments=[...])` once
+     with every clip instead of looping over `generate_video_segment`; it generates them all at the same time.
+
+   - **SEVERAL TASK IDS TO CHECK**: call `check_video_statuses(task_ids=[...])` once instead of
+     `check_video_status` per ID; the checks run concurrently.
+
+5. DAISYCHAIN USAGE (Pipeline Tool):
+   - Gather all prompts from the script.
+   - Call `run_daisychain_pipeline(segments=[{"prompt":"...", "mode":"normal"}, ...], initial_image_url='...')`.
+   - The pipeline will return a list of LOCAL FILE PATHS for the generated segments.
+   - **DO NOT** stitch them properly unless the user asks.
+
+6. STITCHING / COMBINING:
+   - If the user asks to "stitch", "combine", "append", or "merge" videos:
+   - Use `stitch_videos(video_paths=['path1', 'path2', ...])`.
+   - You must collect the paths from the previous pipeline output.
+
+7. REGENERATION / RESUME:
+   - If the user asks to "regenerate segment 2" or "redo the last one" in a chain:
+   - You MUST look at the previous tool output for "New Input URL" or "extracted frame".
+   - Use THAT url as the `image_url` for the specific segment.
+   - DO NOT default to the original start image unless it's Segment 1.
+
+ 7. REGENERATION / RESUME:
+    - If the user asks to "regenerate segment 2" or "redo the last one" in a chain:
+    - You MUST look at the previous tool output for "New Input URL" or "extracted frame".
+    - Use THAT url as the `image_url` for the specific segment.
+    - DO NOT default to the original start image unless it's Segment 1.
+
+ 8. STEP-BY-STEP APPROVAL (CRITICAL):
+    - The user wants to APPROVE every segment.
+    - The tool `process_pipeline_manifest` defaults to `steps=1`. USE THIS DEFAULT.
+    - DO NOT run the whole chain at once unless explicitly told to "auto-run everything".
+
+ 9. FORBIDDEN ACTIONS:
+    - DO NOT use `generate_video_segment` for ANY task involving more than 1 segment.
+    - DO NOT manually loop over segments using `generate_video_segment`. You WILL break continuity.
+    - ALWAYS use `run_daisychain_pipeline` for NEW sequences.
+    - ALWAYS use `process_pipeline_manifest` for RESUMING/RETRYING sequences.
+
+ 10. Monitor status and report final URLs.
+ 13. EDITING PLANS (SINGLE MANIFEST POLICY):
+    - **CRITICAL**: Do NOT create a new pipeline (`run_daisychain_pipeline`) if checking, fixing, or modifying an existing job.
+    - **ALWAYS** reuse the existing `run_id`.
+    - If the user says "Swap segment 1 and 2", "Change the script", or "Use a different first frame":
+      1. Call `edit_pipeline_manifest(run_id, modifications='[...]')`.
+         (Supported actions: 'swap', 'update_prompt', 'delete', 'update_image')
+      2. THEN call `process_pipeline_manifest(run_id)` to execute.
+    - **NEVER** leave a litter of "manifest_..." files. Keep it cleaner.
+
+ 14. URL HANDLING (CRITICAL):
+    - NEVER remove query parameters (e.g. `?ex=...`) from image URLs.
+    - Discord/CDN links REQUIRE these parameters to work. Treating them as "extra" breaks the link.
+    - Pass the FULL URL string exactly as given by the user or tool.
+
+ ## SESSION RULES (CRITICAL - PREVENTS RUN MULTIPLICATION)
+
+ 15. SINGLE RUN PRINCIPLE:
+    - After creating a run with `run_daisychain_pipeline`, IMMEDIATELY call `set_current_run(run_id)`.
+    - If a run already exists in session (check with `get_session_status`), NEVER call `run_daisychain_pipeline`.
+    - Use `process_pipeline_manifest` or `resume_pipeline_run` to continue existing runs.
+
+ 16. APPROVAL WORKFLOW:
+    - After generating a segment, WAIT for user response.
+    - If user says "approved", "looks good", "I like it", "nice": Call `approve_segment(index, path)`.
+    - If user says "retry", "again", "redo": Call `resume_pipeline_run(from_segment=N)` to retry.
+    - NEVER create a new run for retries!
+
+ 17. SCRIPT LOCKING:
+    - When user approves the script draft, call `lock_script(script_json)`.
+    - For retries, use `get_locked_script()` instead of calling `consult_expert_writer` again.
+    - Only call `consult_expert_writer` if user explicitly asks to "edit script" or "rewrite".
+
+ 18. LOCAL FILE HANDLING:
+    - When user provides a local path (e.g., `c:\\path\\to\\video.mp4`):
+      a. First call `upload_local_image(path)` to get a public URL.
+      b. Then use that URL in subsequent operations.
+    - NEVER pass raw local paths to video generation.
+"""
+
+_EDITOR_INSTRUCTIONS = """
+You are a Video Editor specializing in MoviePy.
+Your job is to write and execute Python scripts to edit videos.
+
+CAPABILITIES:
+- Cut/Trim videos
+- Concatenate clips
+- Add text overlays
+- Composite videos
+- Adjust audio volume
+- Add Music
+- Create Data Visualizations (Manim)
+- Overlay content
+
+RULES:
+1. Use the `execute_editor_script` tool to run your code.
+2. ALWAYS assume `from moviepy import *` or specific imports are needed. Each script runs in its own fresh Python process, so nothing (variables, open clips) carries over from earlier scripts; re-open every file you use.
+   - **CRITICAL**: Use `from moviepy import ...`. DO NOT use `from moviepy.editor import ...`.
+3. Handle file paths carefully. If a user provides a path, use it. If creating a new file, output to the current directory or a specific path if requested.
+4. If the user request is vague, ask for clarification or propose a plan before writing code.
+5. Since MoviePy v2.0 is used:
+   - Use `subclipped(start, end)` instead of `subclip`.
+   - Use `with_volume_scaled(factor)` instead of `volumex`.
+   - Use `with_duration(t)` instead of `set_duration`.
+   - Use `with_position(pos)` instead of `set_position`.
+   - `TextClip` needs a font installed or path to font file. Default to "Arial" or similar if unsure, or ask user.
+6. SCRIPT SAVING: 
+   - If the user explicitly asks to save the script, or if the logic is reusable/complex, pass a descriptive name to `save_name` (e.g., "fade_in_effect").
+   - Otherwise, leave `save_name` empty (default) for ephemeral execution.
+7. IMAGE EXPORT: If you extract a frame or create an image, ALWAYS print the absolute path of the output file in your script so it can be captured and used by other agents.
+8. SHORTCUTS: Use the `add_background_music`, `overlay_text`, and `advanced_voice_change` tools for common tasks instead of writing raw scripts if possible.
+   To change the voice on several videos, call `advanced_voice_change_batch` once with all the paths.
+9. MANIM: Use `generate_manim_animation` to create charts/graphs, then `overlay_foreground_video` to add them to a video.
+10. MUSIC: Use `generate_music_track` to create music. The user must review it. Use `add_background_music` with the generated path.
+"""
+
+_TRIAGE_INSTRUCTIONS = """
+You are the PROJECT COORDINATOR for Scorsese's legendary video studio.
+
+🎬 YOUR MISSION: Keep the production moving! Route requests to the right department.
+
+ROUTING RULES (in priority order):
+
+1. [Producer] - APPROVALS & PRODUCTION COMMANDS (HIGHEST PRIORITY):
+   Keywords: "approved", "looks good", "I like it", "nice", "good", "perfect", "yes", "ok", "let's go", "do it"
+   Keywords: "retry", "again", "redo", "try again", "one more time"
+   Keywords: "next", "next segment", "segment 2", "produce", "generate", "roll", "action"
+   Keywords: "stitch", "combine", "join", "final cut", "finish it", "wrap it up"
+   -> Send to Producer immediately.
+
+2. [Drafter] - NEW IDEAS & SCRIPTS:
+   Keywords: "make a video", "create", "I want", "talks about", "script about", "video where"
+   -> User has an IDEA that needs a script. Send to Drafter.
+   -> Even "Make a video about cats" needs drafting first.
+
+3. [Editor] - POST-PRODUCTION:
+   Keywords: "edit", "cut", "trim", "add text", "overlay", "music", "sound"
+   -> Technical editing work. Send to Editor.
+
+GOLDEN RULE: When in doubt about approval words, send to Producer.
+
+Examples:
+"approved" -> Producer
+"I like it" -> Producer  
+"next" -> Producer
+"stitch them" -> Producer
+"make a video about crypto" -> Drafter
+"edit the audio" -> Editor
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _load_guide_cached(path: str) -> str:
+    # A missing/unreadable guide is cached too, so it's only discovered once.
+    # Decoding with errors="replace" means a stray bad byte can't fail the load.
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return _GUIDE_FALLBACK
+    return data.decode("utf-8", errors="replace")
+
+
+@functools.cache
+def _get_guide() -> str:
+    """The guide prefix fed to the writer; read from disk once per process."""
+    return _load_guide_cached(GUIDE_PATH)[:GUIDE_MAX_CHARS]
+
+
 class AgenticApproach:
     def __init__(self, kie_client: KIEClient, logic_model: str = "gpt-4o-mini", creative_model: str = "openai/gpt-4o", session_state=None):
         """
@@ -35,96 +444,121 @@ class AgenticApproach:
         self.logic_model = logic_model
         self.creative_model = creative_model
         self.session_state = session_state  # Store session state reference
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        self.writer_cache = TTLCache(os.path.join(tempfile.gettempdir(), "scorsese_writer_cache"), WRITER_CACHE_TTL)
+        # Read the guide in the background; only the expert writer needs it
+        self._guide_future = _IO_POOL.submit(_get_guide)
         
         # Explicitly configure for OpenRouter to avoid key confusion
         or_key = os.getenv("OPENROUTER_API_KEY")
         or_url = "https://openrouter.ai/api/v1"
         print(f"[System] Initializing Creative Writer with model: {creative_model} via OpenRouter...")
         
-        self.creative_llm = LLMClient(
-            model=creative_model,
-            api_key=or_key,
-            base_url=or_url
-        )
-        self.speech_llm = LLMClient() # Default OpenAI client for TTS
-        
-        self.moviepy_service = MoviePyService()
-        self.image_upload_service = ImageUploadService()
-        self.music_service = MusicService(kie_client=self.kie)
-        self.elevenlabs_service = ElevenLabsService()
-        self.manim_service = ManimService()
+        # One pooled HTTP client shared by both LLM clients and ElevenLabs
+        self.http_client = build_http_client()
+
+        # The services are independent of each other, so build them concurrently
+        # (cold start costs the slowest constructor, not the sum); VideoService
+        # and PipelineService depend on earlier ones and follow in later waves.
+        with ThreadPoolExecutor(max_workers=7, thread_name_prefix="init") as ex:
+            creative_llm = ex.submit(LLMClient, model=creative_model, api_key=or_key, base_url=or_url, http_client=self.http_client)
+            speech_llm = ex.submit(LLMClient, http_client=self.http_client) # Default OpenAI client for TTS
+            moviepy_service = ex.submit(MoviePyService)
+            image_upload_service = ex.submit(ImageUploadService)
+            music_service = ex.submit(MusicService, kie_client=self.kie)
+            elevenlabs_service = ex.submit(ElevenLabsService, http_client=self.http_client)
+            manim_service = ex.submit(ManimService)
+
+            self.creative_llm = creative_llm.result()
+            self.speech_llm = speech_llm.result()
+            self.moviepy_service = moviepy_service.result()
+            self.image_upload_service = image_upload_service.result()
+            self.music_service = music_service.result()
+            self.elevenlabs_service = elevenlabs_service.result()
+            self.manim_service = manim_service.result()
+        # Editing workers import MoviePy in the background from here on
+        self.moviepy_service.prewarm()
 
         # Core Services
         self.video_service = VideoService(self.kie, self.image_upload_service, self.moviepy_service)
         self.pipeline_service = PipelineService(self.video_service, self.moviepy_service)
         
-        self.guide_content = self._load_guide()
-
         
         # --- Tools ---
         
+        # Tools that wait on KIE run their blocking work in a worker thread, so
+        # the event loop keeps serving the agent's other tool calls meanwhile.
+
         @function_tool
-        def generate_video_segment(prompt: str, mode: str = "normal", image_url: str = None) -> str:
+        async def generate_video_segment(prompt: str, mode: str = "normal", image_url: str = None) -> str:
             """
             Generates a video segment using KIE.AI (Grok).
             Returns the Task ID. You must check status later to get the URL.
             Example: generate_video_segment("cat jumping", "fun", image_url="http://...")
             """
-            return self.video_service.generate_segment(prompt, mode, image_url)
+            return await asyncio.to_thread(self.video_service.generate_segment, prompt, mode, image_url)
 
         @function_tool
-        def check_video_status(task_id: str) -> str:
+        async def run_parallel_segments(segments: List[SegmentSpec], image_url: str = None) -> str:
+            """
+            Generates INDEPENDENT clips (no last-frame continuity) concurrently.
+            Only for "independent clips" / "buckshot" requests; story sequences
+            must use `run_daisychain_pipeline`.
+            
+            Args:
+                segments: List of segments, e.g. [{"prompt": "A cat", "mode": "normal"}, ...]
+                image_url: Optional public image URL used as the input for every clip.
+            
+            Returns:
+                One result line per segment, in order.
+            """
+            limit = asyncio.Semaphore(KIE_CONCURRENCY)
+            
+            async def _one(seg: SegmentSpec) -> str:
+                async with limit:
+                    return await asyncio.to_thread(self.video_service.generate_segment, seg.prompt, seg.mode, image_url)
+            
+            results = await asyncio.gather(*(_one(seg) for seg in segments), return_exceptions=True)
+            return "\n\n".join(
+                f"Segment {i}: {r if not isinstance(r, BaseException) else f'Error: {r}'}"
+                for i, r in enumerate(results, 1)
+            )
+
+        @function_tool
+        async def check_video_status(task_id: str) -> str:
             """
             Checks the status of a video generation task.
             Returns status and URL if successful.
             """
-            return self.video_service.check_status(task_id)
+            return await asyncio.to_thread(self.video_service.check_status, task_id)
 
         @function_tool
-        def consult_expert_writer(topic: str, audience: str, goal: str, specific_instructions: str = "") -> str:
-            """
-            Calls an Expert Viral Writer (High-IQ LLM) to draft or edit a Tikok script.
-            Use this for INITIAL DRAFTS and for REFINING CONTENT.
-            Returns the full script content (usually JSON-like text).
+        async def check_video_statuses(task_ids: List[str]) -> str:
             """
-            print(f"[Tool: Expert Writer] Drafting for {topic}...")
+            Checks several video generation tasks at once (concurrently).
             
-            system_prompt = f"""
-            You are a Viral Content Strategist & Video Prompt Engineer.
-            
-            GOAL: Write a TikTok script based on the guide:
-            {self.guide_content[:15000]}
-            
-            CRITICAL: For the 'visual' field of each segment, you MUST use "Structural Prompting" for high-fidelity AI generation.
-            Format visual descriptions as:
-            "Subject: [Description of the character/object]. Action: [Precise movement vectors, MUST INCLUDE 'speaking to camera' if there is dialogue]. Environment: [Lighting/Context]. Technical: [Camera angle/fps]."
-            
-            RULES FOR VISUALS:
-            1. SUBJECT: MUST be generic to match the input image (e.g., "The character in the image", "The speaker"). DO NOT invent gender/clothing details (e.g., "Male trader in hoodie") as this causes morphing artifacts if it conflicts with the user's image.
-            2. NO TEXT: Do NOT include requests for "Text Overlay", "Captions", or "UI elements" in the visual description. The video should be clean.
-            3. LIP SYNC MANDATORY: If the character speaks, the Action MUST explicitly say: "The character is speaking to the camera. Mouth moving in sync with speech."
-            4. NO NARRATION: Do NOT describe the scene as a "documentary" or "b-roll". The character MUST be present and acting.
+            Args:
+                task_ids: KIE task IDs, e.g. ["abc123", "def456"].
             
-            Example Visual:
-            "Subject: The character in the image. Action: Speaking directly to the camera with an excited expression, leaning in. Mouth moving. Environment: A neon-lit room. Technical: Low angle, 24fps. No text."
+            Returns:
+                One status line per task, in order.
+            """
+            results = await asyncio.to_thread(self.video_service.check_statuses, task_ids)
+            return "\n\n".join(f"Task {t}: {results[t]}" for t in task_ids)
 
-            PRIORITY: Focus on MOTIVATED CAMERA MOVEMENT (whip pans, zooms) and EXPRESSIVE FACIAL ACTIONS.
-            AVOID: Excessive VFX (confetti, explosions) or "busy" elements unless the script demands it.
-            
-            JSON STRUCTURE REQUIREMENTS:
-            1. Fields: 'visual', 'spoken', 'text_overlay', 'music', 'sound_effects'.
-            2. SPOKEN TEXT: MUST be spoken naturally. NEVER put raw URLs, wallet hashes, or code snippets in the 'spoken' field (the AI cannot read them). Use "Link in bio" or "Address on screen".
-            3. TEXT OVERLAY: Put all on-screen text HERE, not in 'visual'.
-            
-            Return a valid JSON structure (ViralScript schema).
-            Ensure segments are <6 seconds.
+        def _brief_key(*fields: str) -> str:
+            # Case/whitespace-insensitive brief, plus everything else that shapes the draft
+            brief = tuple(" ".join((f or "").split()).casefold() for f in fields)
+            return cache_key(self.creative_model, self._drafter_sys, *brief)
+
+        def _consult_writer(topic: str, audience: str, goal: str, specific_instructions: str = "") -> str:
+            key = _brief_key(topic, audience, goal, specific_instructions)
+            cached = self.writer_cache.get(key)
+            if cached:
+                print(f"[Tool: Expert Writer] Reusing cached draft for {topic}.")
+                return cached
             
-            CRITICAL CONSTRAINT ADHERENCE:
-            - If the user asks for "one segment", "single segment", or "extending the last segment", you MUST output EXACTLY ONE segment in the JSON list.
-            - Do not generate Intro/Outro segments unless explicitly requested.
-            - Do not ignore the user's explicit request for brevity.
-            - If "Extending", the context is implied (continuation), so start immediately (no "Hey guys!" intro).
-            """
+            print(f"[Tool: Expert Writer] Drafting for {topic}...")
             
             user_prompt = f"""
             Topic: {topic}
@@ -139,12 +573,53 @@ class AgenticApproach:
                 # Use the creative_llm client (OpenRouter/High-IQ)
                 result = self.creative_llm.generate_creative_completion(
                     prompt=user_prompt,
-                    system_prompt=system_prompt,
+                    system_prompt=self._cached_system_blocks,
                     model=self.creative_model
                 )
-                return result
             except Exception as e:
                 return f"Error calling expert writer: {e}"
+            if result:
+                self.writer_cache.set(key, result)
+            return result
+
+        @function_tool
+        def consult_expert_writer(topic: str, audience: str, goal: str, specific_instructions: str = "") -> str:
+            """
+            Calls an Expert Viral Writer (High-IQ LLM) to draft or edit a Tikok script.
+            Use this for INITIAL DRAFTS and for REFINING CONTENT.
+            Returns the full script content (usually JSON-like text).
+            """
+            return _consult_writer(topic, audience, goal, specific_instructions)
+
+        @function_tool
+        def consult_expert_writer_batch(requests_json: str) -> str:
+            """
+            Drafts several independent scripts at once. Prefer this over repeated
+            `consult_expert_writer` calls when there are more than 3 topics.
+            
+            Args:
+                requests_json: JSON list of objects with 'topic', 'audience', 'goal'
+                               and optional 'specific_instructions'.
+            Returns a JSON list of script drafts, in the same order as the requests.
+            """
+            try:
+                batch = json.loads(requests_json)
+                if not isinstance(batch, list):
+                    raise ValueError("expected a JSON list")
+                calls = [
+                    (r["topic"], r.get("audience", ""), r.get("goal", ""), r.get("specific_instructions", ""))
+                    for r in batch
+                ]
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                return f"Invalid batch request: {e}"
+            if not calls:
+                return "[]"
+            
+            # OpenRouter has no batch endpoint; the drafts share the cached system
+            # prompt, so running them concurrently costs about one round-trip.
+            with ThreadPoolExecutor(max_workers=min(WRITER_BATCH_WORKERS, len(calls)), thread_name_prefix="writer") as ex:
+                results = list(ex.map(lambda args: _consult_writer(*args), calls))
+            return json.dumps(results)
 
         @function_tool
         def execute_editor_script(script_code: str, save_name: str = None) -> str:
@@ -164,27 +639,31 @@ class AgenticApproach:
                 print(f"  > Saving script as: {save_name}")
             return self.moviepy_service.run_script(script_code, save_name=save_name)
 
-        def _download_to_temp(url: str, suffix: str = ".mp4") -> str:
-            """Helper to download a file to a temp path."""
-            import tempfile
-            import requests
-            import uuid
-            
+        async def _download_to_temp(url: str, suffix: str = ".mp4") -> str:
+            """
+            Helper to download a file to a temp path without blocking the event
+            loop: streamed with aiohttp when installed, otherwise the blocking
+            download runs in a worker thread.
+            """
             try:
-                fname = f"temp_dl_{uuid.uuid4()}{suffix}"
-                fpath = os.path.join(tempfile.gettempdir(), fname)
-                with requests.get(url, stream=True) as r:
-                    r.raise_for_status()
-                    with open(fpath, 'wb') as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            f.write(chunk)
+                fpath = _new_path(tempfile.gettempdir(), "temp_dl", suffix)
+                if aiohttp is None:
+                    await asyncio.to_thread(download_file, url, fpath)
+                    return fpath
+                timeout = aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT[0], sock_read=HTTP_TIMEOUT[1])
+                async with aiohttp.ClientSession(timeout=timeout) as session:
+                    async with session.get(url) as r:
+                        r.raise_for_status()
+                        with open_download(fpath, r.content_length) as f:
+                            async for chunk in r.content.iter_chunked(DOWNLOAD_CHUNK):
+                                f.write(chunk)
                 return fpath
             except Exception as e:
                 print(f"Download failed: {e}")
                 return None
 
         @function_tool
-        def run_daisychain_pipeline(segments_json: str, initial_image_url: str = None) -> str:
+        async def run_daisychain_pipeline(segments: List[SegmentSpec], initial_image_url: str = None) -> str:
             """
             Executes a robust DAISYCHAIN generation pipeline.
             Guarantees that the output of Segment N is used as the input for Segment N+1.
@@ -192,8 +671,7 @@ class AgenticApproach:
             ⚠️ WARNING: This creates a NEW run. If a run already exists, use `process_pipeline_manifest` instead.
             
             Args:
-                segments_json: A JSON string list of dicts. Example:
-                               '[{"prompt": "A cat", "mode": "normal"}, {"prompt": "The cat flies", "mode": "fun"}]'
+                segments: List of segments, e.g. [{"prompt": "A cat", "mode": "normal"}, {"prompt": "The cat flies", "mode": "fun"}]
                 initial_image_url: Optional starting image URL for the first segment.
             
             Returns:
@@ -206,7 +684,10 @@ class AgenticApproach:
                         f"Use `process_pipeline_manifest('{existing_run}', steps=1)` to continue, "
                         f"or `reset_session()` to start fresh.")
             
-            result = self.pipeline_service.run_daisychain(segments_json, initial_image_url)
+            # Segments stay serial (each needs the previous last frame); only the wait leaves the loop
+            result = await asyncio.to_thread(
+                self.pipeline_service.run_daisychain, [seg.model_dump() for seg in segments], initial_image_url
+            )
             
             # AUTO-SET: Extract run_id from result and lock it in session
             if self.session_state and result.startswith("RUN_ID:"):
@@ -222,24 +703,21 @@ class AgenticApproach:
             return result
 
         @function_tool
-        def stitch_videos(video_paths: str) -> str:
+        def stitch_videos(video_paths: List[str]) -> str:
             """
             Stitches (concatenates) multiple video files into a single video.
             
             Args:
-                video_paths: A JSON string list of absolute file paths to the videos. 
-                             Example: '["C:/path/to/vid1.mp4", "C:/path/to/vid2.mp4"]'
-                             OR: '["C:/path/to/manifest_1234.json"]' to automatically load from a run.
+                video_paths: Absolute file paths to the videos, in order.
+                             Example: ["C:/path/to/vid1.mp4", "C:/path/to/vid2.mp4"]
+                             OR: ["C:/path/to/manifest_1234.json"] to automatically load from a run.
             
             Returns:
                 Path to the stitched video.
             """
-            try:
-                paths = json.loads(video_paths)
-                if not isinstance(paths, list) or len(paths) < 2:
-                    return "Error: Please provide a list of at least 2 video paths."
-            except:
-                return "Error: video_paths must be a valid JSON string list."
+            paths = list(video_paths)
+            if not paths:
+                return "Error: Please provide at least one video path or a manifest."
                 
             return self.pipeline_service.stitch_videos(paths)
 
@@ -297,7 +775,7 @@ class AgenticApproach:
             return self.pipeline_service.update_segment_status(run_id_or_path, segment_index, status, notes)
 
         @function_tool
-        def process_pipeline_manifest(run_id_or_path: str, steps: int = 1) -> str:
+        async def process_pipeline_manifest(run_id_or_path: str, steps: int = 1) -> str:
             """
             Executes or Resumes a video generation pipeline based on its Manifest.
             Use this to:
@@ -310,7 +788,7 @@ class AgenticApproach:
                 run_id_or_path: Run ID (e.g. 'a1b2c3d4') OR Path.
                 steps: LIMIT of segments to process. Defaults to 1 (Step-by-Step). Set to 100 for "auto-run".
             """
-            return self.pipeline_service.process_manifest(run_id_or_path, limit=steps)
+            return await asyncio.to_thread(self.pipeline_service.process_manifest, run_id_or_path, limit=steps)
 
         @function_tool
         def edit_pipeline_manifest(run_id: str, modifications_json: str) -> str:
@@ -326,9 +804,8 @@ class AgenticApproach:
                     '[{"action": "update_prompt", "index": 1, "prompt": "New text..."}]'
                     '[{"action": "delete", "index": 3}]'
             """
-            import json
             try:
-                mods = json.loads(modifications_json)
+                mods = loads(modifications_json)
                 return self.pipeline_service.edit_manifest(run_id, mods)
             except Exception as e:
                 return f"Error parsing modifications JSON: {e}"
@@ -396,7 +873,7 @@ class AgenticApproach:
             Use this when retrying generation to get the original approved script.
             """
             if self.session_state and self.session_state.locked_script:
-                return self.session_state.locked_script
+                return self.session_state.locked_script_json
             return "No script locked. Call consult_expert_writer first, then lock_script after approval."
 
         @function_tool
@@ -454,9 +931,8 @@ class AgenticApproach:
                 return f"Segment {segment_index} prompt replaced.\n{result}"
             elif prompt_edit:
                 # Get current prompt and ask LLM to modify it
-                manifest = self.pipeline_service.get_manifest(run_id)
                 try:
-                    data = json.loads(manifest)
+                    data = self.pipeline_service.get_manifest_dict(run_id)
                     seg = next((s for s in data["segments"] if s["index"] == segment_index), None)
                     if not seg:
                         return f"Error: Segment {segment_index} not found."
@@ -524,44 +1000,15 @@ class AgenticApproach:
             if not music_file:
                 return "Error: Could not generate or find music."
 
-            import uuid
-            output_filename = f"music_added_{uuid.uuid4().hex[:6]}.mp4"
-            output_path = os.path.join(os.path.dirname(video_path), output_filename)
+            output_path = _new_path(os.path.dirname(video_path), "music_added")
             
-            script = f"""
-import os
-from moviepy import VideoFileClip, AudioFileClip, CompositeAudioClip
-
-video_path = r"{video_path}"
-music_path = r"{music_file}"
-output_path = r"{output_path}"
-volume = {volume}
-
-try:
-    video = VideoFileClip(video_path)
-    music = AudioFileClip(music_path).with_volume_scaled(volume)
-    
-    # Loop music if shorter than video, or trim if longer
-    if music.duration < video.duration:
-        music = music.with_effects([lambda c: c.loop(duration=video.duration)])
-    else:
-        music = music.subclipped(0, video.duration)
-        
-    # Mix with original video audio if it exists
-    original_audio = video.audio
-    if original_audio:
-        final_audio = CompositeAudioClip([original_audio, music])
-    else:
-        final_audio = music
-        
-    final_video = video.with_audio(final_audio)
-    final_video.write_videofile(output_path, codec="libx264", audio_codec="aac")
-    print(f"MUSIC_SUCCESS: {{output_path}}")
-
-except Exception as e:
-    print(f"MUSIC_ERROR: {{e}}")
-"""
-            log = self.moviepy_service.run_script(script, save_name="add_music")
+            # Copy the video stream and only encode/mix the audio
+            if ffmpeg_tools.add_music_copy_video(video_path, music_file, output_path, volume):
+                return f"Success! Music added: {output_path}"
+            
+            log = self.moviepy_service.run_template(
+                "add_music", video_path=video_path, music_path=music_file, output_path=output_path, volume=volume
+            )
             if "MUSIC_SUCCESS" in log:
                 return f"Success! Music added: {output_path}"
             else:
@@ -581,41 +1028,15 @@ except Exception as e:
             """
             print(f"[Tool: Overlay] Adding text '{text}' to {video_path}...")
             
-            import uuid
-            output_filename = f"text_overlay_{uuid.uuid4().hex[:6]}.mp4"
-            output_path = os.path.join(os.path.dirname(video_path), output_filename)
+            output_path = _new_path(os.path.dirname(video_path), "text_overlay")
             
-            script = f"""
-import os
-from moviepy import VideoFileClip, TextClip, CompositeVideoClip
-
-video_path = r"{video_path}"
-output_path = r"{output_path}"
-text_content = "{text}"
-pos = "{position}"
-col = "{color}"
-fs = {font_size}
-
-try:
-    video = VideoFileClip(video_path)
-    
-    # Create TextClip
-    # Note: MoviePy v2 requirements for TextClip can be tricky with fonts.
-    # We will try default. If fails, we might need ImageMagick or specific font path.
-    # Assuming basic configuration for now.
-    
-    txt_clip = TextClip(font="Arial", text=text_content, font_size=fs, color=col)
-    txt_clip = txt_clip.with_position(pos).with_duration(video.duration)
-    
-    final_video = CompositeVideoClip([video, txt_clip])
-    final_video.write_videofile(output_path, codec="libx264", audio_codec="aac")
-    
-    print(f"OVERLAY_SUCCESS: {{output_path}}")
-
-except Exception as e:
-    print(f"OVERLAY_ERROR: {{e}}")
-"""
-            log = self.moviepy_service.run_script(script, save_name="overlay_text")
+            if ffmpeg_tools.overlay_text(video_path, output_path, text, position, color, font_size):
+                return f"Success! Text added: {output_path}"
+            
+            log = self.moviepy_service.run_template(
+                "overlay_text", video_path=video_path, output_path=output_path, text=text,
+                position=position, color=color, font_size=font_size
+            )
             if "OVERLAY_SUCCESS" in log:
                 return f"Success! Text added: {output_path}"
             else:
@@ -636,8 +1057,11 @@ except Exception as e:
             """
             return self.video_service.extend_segment(video_path, prompt, mode)
 
+        # Caps the voice changes in flight at once, across concurrent tool calls
+        voice_slots = asyncio.Semaphore(VOICE_CONCURRENCY)
+
         @function_tool
-        def advanced_voice_change(video_path: str, voice_id: str = "JBFqnCBsd6RMkjVDRZzb", skip_kie: bool = False) -> str:
+        async def advanced_voice_change(video_path: str, voice_id: str = "JBFqnCBsd6RMkjVDRZzb", skip_kie: bool = False) -> str:
             """
             Advanced Audio Pipeline:
             1. Extracts audio from video.
@@ -645,21 +1069,56 @@ except Exception as e:
             3. Uses ElevenLabs to change the voice (Speech-to-Speech) while keeping pacing.
             4. Remarries audio to video.
             
-            Caching: On retry, if KIE was already done for this video, the cleaned audio is reused.
+            Caching: If KIE already isolated this exact audio (same video, a retry, or a copy whose audio stream is byte-identical), the cleaned audio is reused.
             
             Args:
                 video_path: Path to video file.
                 voice_id: ElevenLabs Voice ID (default: 'Nicole').
                 skip_kie: Force skip KIE isolation (use cached or raw audio).
             """
+            async with voice_slots:
+                return await _advanced_voice_change(video_path, voice_id, skip_kie)
+
+        @function_tool
+        async def advanced_voice_change_batch(video_paths: List[str], voice_id: str = "JBFqnCBsd6RMkjVDRZzb") -> str:
+            """
+            Runs `advanced_voice_change` on several videos (e.g. every segment) at the same time.
+            
+            Args:
+                video_paths: Paths to the video files.
+                voice_id: ElevenLabs Voice ID applied to all of them.
+            
+            Returns:
+                One result line per video, in order.
+            """
+            async def _one(path: str) -> str:
+                async with voice_slots:
+                    return await _advanced_voice_change(path, voice_id, False)
+            
+            results = await asyncio.gather(*(_one(p) for p in video_paths), return_exceptions=True)
+            return "\n\n".join(
+                f"{p}: {r if not isinstance(r, BaseException) else f'Error: {r}'}"
+                for p, r in zip(video_paths, results)
+            )
+
+        async def _advanced_voice_change(video_path: str, voice_id: str, skip_kie: bool) -> str:
             print(f"[Tool: Adv.Voice] Starting advanced pipeline for {video_path}...")
             
-            import uuid
             cleaned_local = None
             
+            # Validate the target voice while extraction/KIE run, so a bad voice
+            # id is reported as soon as the cleaned audio is ready
+            async def _prefetch_voice():
+                try:
+                    await asyncio.to_thread(self.elevenlabs_service.get_voice, voice_id)
+                except Exception as e:
+                    return e
+                return None
+            voice_check = asyncio.create_task(_prefetch_voice())
+            
             # Check session cache for previously cleaned audio for THIS video
-            cache_key = os.path.normpath(video_path)
-            cached = self.session_state.cleaned_audio_cache.get(cache_key) if self.session_state else None
+            session_key = os.path.normpath(video_path)
+            cached = self.session_state.cleaned_audio_cache.get(session_key) if self.session_state else None
             
             if cached and os.path.exists(cached.get("local", "")):
                 print(f"  > Using CACHED cleaned audio (KIE skip): {cached['local']}")
@@ -667,61 +1126,65 @@ except Exception as e:
             else:
                 # Full pipeline: Extract -> Upload -> KIE -> Download
                 
-                # 1. Extract Audio
-                audio_name = f"extracted_audio_{uuid.uuid4().hex[:6]}.mp3"
-                
-                extract_script = f"""
-import os
-from moviepy import VideoFileClip
-video_path = r"{video_path}"
-output_path = os.path.join(os.getcwd(), "scorsese", "{audio_name}")
-try:
-    with VideoFileClip(video_path) as clip:
-        if clip.audio:
-            clip.audio.write_audiofile(output_path)
-            print(f"AUDIO_EXTRACTED: {{output_path}}")
-        else:
-            print("NO_AUDIO_FOUND")
-except Exception as e:
-    print(f"EXTRACT_ERROR: {{e}}")
-"""
-                log = self.moviepy_service.run_script(extract_script)
-                extracted_audio_path = os.path.join(os.getcwd(), "scorsese", audio_name)
+                # 1. Extract Audio to MP3 (ffmpeg when available, else MoviePy)
+                extracted_audio_path = _new_path(os.path.join(os.getcwd(), "scorsese"), "extracted_audio", ".mp3")
+                if not await asyncio.to_thread(ffmpeg_tools.extract_audio, video_path, extracted_audio_path):
+                    log = await asyncio.to_thread(
+                        self.moviepy_service.run_template, "extract_audio",
+                        video_path=video_path, output_path=extracted_audio_path
+                    )
+                    if not os.path.exists(extracted_audio_path):
+                        return f"Failed to extract audio. Log: {log}"
                 
-                if not os.path.exists(extracted_audio_path):
-                    return f"Failed to extract audio. Log: {log}"
+                # Byte-identical extracted audio (same video, or a copy with the
+                # same audio stream) was isolated before
+                audio_digest = await asyncio.to_thread(_file_digest, extracted_audio_path)
+                isolated_path = _find_cached(KIE_AUDIO_CACHE_DIR, audio_digest)
                 
                 try:
-                    # 2. Upload to Public URL (for KIE)
-                    print(f"  > Uploading audio for KIE processing...")
-                    public_url = self.image_upload_service.upload_image(extracted_audio_path)
-                    print(f"  > Audio URL: {public_url}")
-                    
-                    # 3. KIE Audio Isolation
-                    print(f"  > Submitting KIE Isolation task...")
-                    task_id = self.kie.isolate_audio(public_url)
-                    
-                    print(f"  > Waiting for isolation (Task: {task_id})...")
-                    status = self.kie.wait_for_task(task_id, timeout=300)
-                    
-                    if status.get("state") != "success":
-                        return f"KIE Isolation failed: {status.get('failMsg')}"
-                    
-                    cleaned_audio_urls = status.get("video_urls", [])
-                    if not cleaned_audio_urls:
-                        return "KIE Success but no audio URL found."
-                    
-                    cleaned_url = cleaned_audio_urls[0]
-                    print(f"  > Cleaned Audio URL: {cleaned_url}")
+                    if isolated_path:
+                        print(f"  > Using CACHED isolated audio (KIE skip): {isolated_path}")
+                        os.utime(isolated_path)  # mark as recently used
+                        cleaned_url = None
+                    else:
+                        # 2. Upload to Public URL (for KIE)
+                        print(f"  > Uploading audio for KIE processing...")
+                        public_url = await asyncio.to_thread(self.image_upload_service.upload_image, extracted_audio_path)
+                        print(f"  > Audio URL: {public_url}")
+                        
+                        # 3. KIE Audio Isolation
+                        print(f"  > Submitting KIE Isolation task...")
+                        task_id = await asyncio.to_thread(self.kie.isolate_audio, public_url)
+                        
+                        print(f"  > Waiting for isolation (Task: {task_id})...")
+                        # Isolation takes ~30-120s: start at 2s and back off to 15s between polls
+                        status = await self.kie.wait_for_task_async(task_id, poll_interval=2.0, max_interval=15.0, timeout=300)
+                        
+                        if status.get("state") != "success":
+                            return f"KIE Isolation failed: {status.get('failMsg')}"
+                        
+                        cleaned_audio_urls = status.get("video_urls", [])
+                        if not cleaned_audio_urls:
+                            return "KIE Success but no audio URL found."
+                        
+                        cleaned_url = cleaned_audio_urls[0]
+                        print(f"  > Cleaned Audio URL: {cleaned_url}")
+                        
+                        # 4. Download Cleaned Audio (keeping the container KIE returned)
+                        ext = os.path.splitext(urlparse(cleaned_url).path)[1].lower() or ".mp3"
+                        downloaded = await _download_to_temp(cleaned_url, suffix=ext)
+                        if not downloaded:
+                            return "Failed to download cleaned audio."
+                        isolated_path = os.path.join(KIE_AUDIO_CACHE_DIR, audio_digest + ext)
+                        os.makedirs(KIE_AUDIO_CACHE_DIR, exist_ok=True)
+                        shutil.move(downloaded, isolated_path)
+                        await asyncio.to_thread(_prune_cache_dir, KIE_AUDIO_CACHE_DIR, KIE_AUDIO_CACHE_MAX_BYTES)
                     
-                    # 4. Download Cleaned Audio
-                    cleaned_local = _download_to_temp(cleaned_url, suffix=".mp3")
-                    if not cleaned_local:
-                        return "Failed to download cleaned audio."
+                    cleaned_local = isolated_path
                     
                     # Cache the cleaned audio for potential retries
                     if self.session_state:
-                        self.session_state.cleaned_audio_cache[cache_key] = {
+                        self.session_state.cleaned_audio_cache[session_key] = {
                             "url": cleaned_url,
                             "local": cleaned_local
                         }
@@ -736,54 +1199,38 @@ except Exception as e:
                 except Exception as e:
                     return f"KIE Pipeline Error: {e}"
             
+            voice_error = await voice_check
+            if voice_error:
+                return f"ElevenLabs voice '{voice_id}' unavailable: {voice_error}. Cached cleaned audio preserved for retry."
+            
             try:
                 # 5. ElevenLabs Voice Change
                 print(f"  > Changing Voice (ID: {voice_id})...")
-                final_audio_path = self.elevenlabs_service.change_voice(cleaned_local, voice_id)
+                final_audio_path = await asyncio.to_thread(self.elevenlabs_service.change_voice, cleaned_local, voice_id)
                 print(f"  > Voice Changed: {final_audio_path}")
                 
-                # 6. Remarry to Video
-                final_video_name = f"final_voice_{uuid.uuid4().hex[:6]}.mp4"
-                final_video_path = os.path.join(os.getcwd(), "scorsese", "output", final_video_name)
-                os.makedirs(os.path.dirname(final_video_path), exist_ok=True)
+                # 6. Remarry to Video (video stream copied; MoviePy re-encode as fallback)
+                final_video_path = _new_path(OUTPUT_DIR, "final_voice")
                 
-                merge_script = f"""
-import os
-from moviepy import VideoFileClip, AudioFileClip
-video_path = r"{video_path}"
-audio_path = r"{final_audio_path}"
-output_path = r"{final_video_path}"
-
-try:
-    video = VideoFileClip(video_path)
-    audio = AudioFileClip(audio_path)
-    
-    # Trim audio to video duration if needed
-    if audio.duration > video.duration:
-        audio = audio.subclipped(0, video.duration)
-        
-    final = video.with_audio(audio)
-    final.write_videofile(output_path, codec="libx264", audio_codec="aac")
-    print(f"MERGE_SUCCESS: {{output_path}}")
-except Exception as e:
-    print(f"MERGE_ERROR: {{e}}")
-"""
-                merge_log = self.moviepy_service.run_script(merge_script, save_name="merge_voice")
+                merge_log = ""
+                merged = await asyncio.to_thread(ffmpeg_tools.replace_audio, video_path, final_audio_path, final_video_path)
+                if not merged:
+                    merge_log = await asyncio.to_thread(
+                        self.moviepy_service.run_template, "merge_audio",
+                        video_path=video_path, audio_path=final_audio_path, output_path=final_video_path
+                    )
+                    merged = "MERGE_SUCCESS" in merge_log
                 
                 # Cleanup voice-changed audio (but keep cached cleaned audio for potential re-retries)
                 try: 
                     os.remove(final_audio_path)
                 except: pass
                 
-                if "MERGE_SUCCESS" in merge_log:
-                    # Clear cache on success (full pipeline done)
-                    if self.session_state and cache_key in self.session_state.cleaned_audio_cache:
-                        try:
-                            cached_path = self.session_state.cleaned_audio_cache[cache_key].get("local")
-                            if cached_path and os.path.exists(cached_path):
-                                os.remove(cached_path)
-                        except: pass
-                        del self.session_state.cleaned_audio_cache[cache_key]
+                if merged:
+                    # Clear the retry entry on success; the isolated track stays in
+                    # KIE_AUDIO_CACHE_DIR for the next run with the same audio
+                    if self.session_state:
+                        self.session_state.cleaned_audio_cache.pop(session_key, None)
                     return f"SUCCESS. Video with replaced voice: {final_video_path}"
                 else:
                     return f"Failed to merge final video. Log: {merge_log}"
@@ -792,7 +1239,7 @@ except Exception as e:
                 return f"ElevenLabs/Merge Error: {e}. Cached cleaned audio preserved for retry."
 
         @function_tool
-        def generate_manim_animation(prompt: str) -> str:
+        def generate_manim_animation(prompt: str, quality: str = "l") -> str:
             """
             Generates a data visualization or mathematical animation using Manim.
             The agent uses the Creative Writer (Expert Coder) to generate the Manim script.
@@ -800,6 +1247,7 @@ except Exception as e:
             
             Args:
                 prompt: Description of the animation (e.g., "A pie chart showing market share 70% vs 30%").
+                quality: 'l' (480p, default; enough for scaled-down overlays), 'm' (720p) or 'h' (1080p) for hero visuals.
             """
             print(f"[Tool: Manim] Generating animation for: {prompt}")
             
@@ -819,10 +1267,10 @@ except Exception as e:
             try:
                 script_code = self.creative_llm.generate_completion(prompt, system_prompt=sys_prompt)
                 # Cleanup potential formatting
-                script_code = script_code.replace("```python", "").replace("```", "").strip()
+                script_code = _MD_FENCE.sub("", script_code).strip()
                 
                 # 2. Render
-                video_path = self.manim_service.render_scene(script_code, "GeneratedScene", quality="m")
+                video_path = self.manim_service.render_scene(script_code, "GeneratedScene", quality=quality)
                 return f"SUCCESS. Manim Animation generated: {video_path}"
                 
             except Exception as e:
@@ -842,50 +1290,12 @@ except Exception as e:
                 scale: Scale factor for foreground (0.0 to 1.0).
             """
             print(f"[Tool: Overlay] Overlaying {foreground_video} on {background_video}...")
-            import uuid
-            output_name = f"overlay_{uuid.uuid4().hex[:6]}.mp4"
-            final_path = os.path.join(os.getcwd(), "scorsese", "output", output_name)
+            final_path = _new_path(OUTPUT_DIR, "overlay")
             
-            script = f"""
-import os
-from moviepy import VideoFileClip, CompositeVideoClip, vfx
-
-bg_path = r"{background_video}"
-fg_path = r"{foreground_video}"
-output_path = r"{final_path}"
-
-try:
-    bg = VideoFileClip(bg_path)
-    fg = VideoFileClip(fg_path)
-    
-    # Scale foreground
-    fg = fg.resized(scale={scale})
-    
-    # Position
-    pos = "{position}"
-    # Simple mapping for common strings, or let moviepy handle it
-    
-    fg = fg.with_position(pos)
-    
-    # Simple Luma Key for Manim (Black Background -> Transparent)
-    # MoviePy 2.0+ mask color handling
-    fg = fg.with_effects([vfx.MaskColor(color=[0,0,0], threshold=10, stiffness=5)])
-    
-    # Loop fg if shorter than bg, or vice versa?
-    # Usually we want the animation to play once or loop over the bg.
-    # Let's assume we play it once on top of bg.
-    
-    # If FG is longer than BG, extend BG? No, usually clip FG or extend BG last frame.
-    # Simple compositing:
-    final = CompositeVideoClip([bg, fg])
-    
-    final.write_videofile(output_path, codec="libx264", audio_codec="aac")
-    print(f"OVERLAY_SUCCESS: {{output_path}}")
-    
-except Exception as e:
-    print(f"OVERLAY_ERROR: {{e}}")
-"""
-            log = self.moviepy_service.run_script(script, save_name="manim_overlay")
+            log = self.moviepy_service.run_template(
+                "overlay_video", background_video=background_video, foreground_video=foreground_video,
+                output_path=final_path, position=position, scale=scale
+            )
             
             if "OVERLAY_SUCCESS" in log:
                 return f"SUCCESS. Overlay video created: {final_path}"
@@ -905,283 +1315,71 @@ except Exception as e:
             """
             return self.music_service.generate_music(prompt, instrumental)
 
-        # --- Agents ---
+        # --- Tool sets (the agents themselves are built on first use) ---
+
+        # The tools close over this instance, so the sets are built here once
+        # and the Editor's post-production set is shared with the Producer.
+        self._drafter_tools = [consult_expert_writer, consult_expert_writer_batch]
+        self._editor_tools = [execute_editor_script, stitch_videos, add_background_music, overlay_text, advanced_voice_change, advanced_voice_change_batch, generate_manim_animation, overlay_foreground_video, generate_music_track]
+        self._producer_tools = [generate_video_segment, run_parallel_segments, check_video_status, check_video_statuses, upload_local_image, run_daisychain_pipeline, extract_and_upload_last_frame, extend_video_segment, get_pipeline_manifest, update_segment_status, process_pipeline_manifest, edit_pipeline_manifest, set_current_run, approve_segment, lock_script, get_locked_script, resume_pipeline_run, get_session_status, edit_segment_prompt, reset_session, *self._editor_tools]
 
-        self.drafter_agent = Agent(
+    # Agents are built on first use rather than with every instance; asking
+    # for the triage agent materializes the specialists it hands off to.
+
+    @functools.cached_property
+    def drafter_agent(self):
+        return Agent(
             name="Drafter",
             model=self.logic_model,
-            instructions="""
-            You are the SCRIPT DEPARTMENT for Martin Scorsese's viral video production studio.
-            
-            YOUR MISSION: Draft scripts that will become legendary content.
-            
-            PERSONALITY:
-            - You're working for a legendary director who demands excellence
-            - Be confident, creative, and efficient
-            - After drafting, PUSH the user towards the next step
-            
-            WORKFLOW:
-            1. Call `consult_expert_writer` with the user's idea.
-            2. Present the script cleanly.
-            3. ALWAYS end with a call to action like:
-               "🎬 The script is ready, boss! Say **'approved'** and we'll start rolling cameras on Segment 1."
-               OR
-               "Ready when you are! Just say **'produce it'** or **'approved'** to begin production."
-            
-            RULES:
-            1. You DO NOT write scripts yourself. Call the tool.
-            2. Do not ask for more info - just call the tool with what you have.
-            3. ALWAYS suggest the next step after presenting the script.
-            """,
-            tools=[consult_expert_writer]
+            instructions=_DRAFTER_INSTRUCTIONS,
+            tools=self._drafter_tools
         )
 
-        self.producer_agent = Agent(
+    @functools.cached_property
+    def producer_agent(self):
+        return Agent(
             name="Producer",
             model=self.logic_model,
-            instructions="""
-            You are the EXECUTIVE PRODUCER for Scorsese's viral video studio.
-            
-            🎬 THE VISION: You're making FILMS, not just clips. Every project follows this pipeline:
-            
-            PRODUCTION PIPELINE:
-            1. 📝 SCRIPT → Get approved script from Drafter
-            2. 🎥 SEGMENT 1 → Generate, show to director for approval
-            3. 🎥 SEGMENT 2 → Generate using last frame continuity
-            4. ... (repeat for all segments)
-            5. 🎞️ STITCH → Combine all approved segments
-            6. 🎬 FINAL CUT → Deliver the masterpiece
-            
-            YOUR PERSONALITY:
-            - You're working for SCORSESE. Mediocrity is not an option.
-            - Be PROACTIVE. After each step, suggest the next one.
-            - Keep momentum. The director wants to see this FINISHED.
-            - Celebrate wins: "Segment 1 is looking FIRE 🔥 Ready for Segment 2?"
-            
-            AFTER EVERY ACTION, suggest next step:
-            - After segment generation: "Segment X complete! Say **'approved'** to lock it in, or **'retry'** to try again."
-            - After approval: "Locked! Ready to roll on Segment Y? Say **'next'** or **'generate segment Y'**."
-            - After final segment: "All segments done! Say **'stitch'** to create the final cut!"
-            - After stitching: "🎬 THE FILM IS COMPLETE! Your masterpiece awaits."
-            
-            ## APPROVAL HANDLING (PRIORITY)
-            
-            ⚠️ CRITICAL RULE: ONE SEGMENT PER TURN ⚠️
-            - After generating ANY segment, you MUST STOP and wait for user approval.
-            - NEVER generate Segment 2 immediately after Segment 1 in a single turn.
-            - NEVER call `run_daisychain_pipeline` if an active run already exists.
-            - ALWAYS ask "Ready for Segment N?" and WAIT for user response.
-            
-            When user says "approved", "looks good", "I like it", "nice", etc.:
-            
-            1. FIRST: Call `get_session_status()` to see current state.
-            2. IF no active run exists:
-               - The user approved a SCRIPT draft from the Drafter.
-               - Call `lock_script(script_json)` with the script from the conversation.
-               - Then call `run_daisychain_pipeline(...)` to start production (generates Segment 1 ONLY).
-               - Immediately call `set_current_run(run_id)` with the returned run_id.
-               - ⛔ STOP HERE. Tell them: "🎬 Segment 1 is ready! Say **'approved'** to lock it in and continue to Segment 2."
-               - DO NOT auto-generate Segment 2. WAIT for user.
-            3. IF an active run exists:
-               - The user approved a generated SEGMENT.
-               - Call `approve_segment(segment_index, video_path)`.
-               - Check if more segments remain:
-                 - If YES: Ask "🎬 Locked! Ready to roll on Segment N? Say **'next'** or **'approved'** to generate it."
-                 - ⛔ DO NOT auto-generate. WAIT for user to say "next" or "approved" again.
-                 - If all done: "🎬 All segments approved! Say **'stitch'** for the final cut!"
-            
-            When user says "next", "continue", "generate segment N":
-            - Call `process_pipeline_manifest(run_id, steps=1)` to generate the NEXT pending segment.
-            - ⛔ STOP after generation. Ask for approval again.
-            
-            When user says "retry", "again", "try again":
-            - Call `resume_pipeline_run(from_segment=N)` where N is the segment to retry.
-            - Do NOT create a new run!
-            
-            CRITICAL INSTRUCTIONS:
-            1. For each segment, construct a prompt appropriate to the content type:
-               - **TALKING HEAD** (character speaks to camera): 
-                 Format: "Using the attached image as reference, animate the character speaking. The character says: '{spoken}'. {visual_description}"
-               - **ACTION/SCENE** (no dialogue, just motion):
-                 Format: "Using the attached image as reference, animate: {action_description}. {visual_details}"
-               - **PRODUCT/OBJECT** (showing something):
-                 Format: "Using the attached image as reference, animate the scene: {description}"
-               - Use descriptive terms that match the content (e.g., "lip-sync" only if there's dialogue).
-            4. EXECUTION STRATEGY:
-               - **GOLDEN RULE**: If the video has multiple segments that tell a STORY (Seg 1 -> Seg 2), you **MUST** use `run_daisychain_pipeline`.
-                 -> This handles the "Seg 1 Last Frame -> Seg 2 Input" continuity automatically.
-                 -> Do NOT try to manually call `generate_video_segment` for sequential parts. You will break the visual continuity.
-               
-               - **"MANUAL DAISYCHAIN"**: This just means running the `run_daisychain_pipeline` (which generates segments) and then letting the user stitch them later.
-                 -> So, if user says "manual daisychain", CALL `run_daisychain_pipeline`.
-               
-               - **TRUE MANUAL / DEBUG**: Only use `generate_video_segment` singly if:
-                 a. The user explicitly asks to "regenerate segment X" (fixing a mistake).
-                 b. The user explicitly says "independent clips" or "buckshot" (no continuity).
-                 c. You are strictly debugging.
-
-            5. DAISYCHAIN USAGE (Pipeline Tool):
-               - Gather all prompts from the script.
-               - Call `run_daisychain_pipeline(segments='[{"prompt":"...", "mode":"normal"}, ...]', initial_image_url='...')`.
-               - The pipeline will return a list of LOCAL FILE PATHS for the generated segments.
-               - **DO NOT** stitch them properly unless the user asks.
-               
-            6. STITCHING / COMBINING:
-               - If the user asks to "stitch", "combine", "append", or "merge" videos:
-               - Use `stitch_videos(video_paths=['path1', 'path2', ...])`.
-               - You must collect the paths from the previous pipeline output.
-               
-            7. REGENERATION / RESUME:
-               - If the user asks to "regenerate segment 2" or "redo the last one" in a chain:
-               - You MUST look at the previous tool output for "New Input URL" or "extracted frame".
-               - Use THAT url as the `image_url` for the specific segment.
-               - DO NOT default to the original start image unless it's Segment 1.
-               
-             7. REGENERATION / RESUME:
-                - If the user asks to "regenerate segment 2" or "redo the last one" in a chain:
-                - You MUST look at the previous tool output for "New Input URL" or "extracted frame".
-                - Use THAT url as the `image_url` for the specific segment.
-                - DO NOT default to the original start image unless it's Segment 1.
-                
-             8. STEP-BY-STEP APPROVAL (CRITICAL):
-                - The user wants to APPROVE every segment.
-                - The tool `process_pipeline_manifest` defaults to `steps=1`. USE THIS DEFAULT.
-                - DO NOT run the whole chain at once unless explicitly told to "auto-run everything".
-                
-             9. FORBIDDEN ACTIONS:
-                - DO NOT use `generate_video_segment` for ANY task involving more than 1 segment.
-                - DO NOT manually loop over segments using `generate_video_segment`. You WILL break continuity.
-                - ALWAYS use `run_daisychain_pipeline` for NEW sequences.
-                - ALWAYS use `process_pipeline_manifest` for RESUMING/RETRYING sequences.
-                
-             10. Monitor status and report final URLs.
-             13. EDITING PLANS (SINGLE MANIFEST POLICY):
-                - **CRITICAL**: Do NOT create a new pipeline (`run_daisychain_pipeline`) if checking, fixing, or modifying an existing job.
-                - **ALWAYS** reuse the existing `run_id`.
-                - If the user says "Swap segment 1 and 2", "Change the script", or "Use a different first frame":
-                  1. Call `edit_pipeline_manifest(run_id, modifications='[...]')`.
-                     (Supported actions: 'swap', 'update_prompt', 'delete', 'update_image')
-                  2. THEN call `process_pipeline_manifest(run_id)` to execute.
-                - **NEVER** leave a litter of "manifest_..." files. Keep it cleaner.
-                
-             14. URL HANDLING (CRITICAL):
-                - NEVER remove query parameters (e.g. `?ex=...`) from image URLs.
-                - Discord/CDN links REQUIRE these parameters to work. Treating them as "extra" breaks the link.
-                - Pass the FULL URL string exactly as given by the user or tool.
-                
-             ## SESSION RULES (CRITICAL - PREVENTS RUN MULTIPLICATION)
-             
-             15. SINGLE RUN PRINCIPLE:
-                - After creating a run with `run_daisychain_pipeline`, IMMEDIATELY call `set_current_run(run_id)`.
-                - If a run already exists in session (check with `get_session_status`), NEVER call `run_daisychain_pipeline`.
-                - Use `process_pipeline_manifest` or `resume_pipeline_run` to continue existing runs.
-                
-             16. APPROVAL WORKFLOW:
-                - After generating a segment, WAIT for user response.
-                - If user says "approved", "looks good", "I like it", "nice": Call `approve_segment(index, path)`.
-                - If user says "retry", "again", "redo": Call `resume_pipeline_run(from_segment=N)` to retry.
-                - NEVER create a new run for retries!
-                
-             17. SCRIPT LOCKING:
-                - When user approves the script draft, call `lock_script(script_json)`.
-                - For retries, use `get_locked_script()` instead of calling `consult_expert_writer` again.
-                - Only call `consult_expert_writer` if user explicitly asks to "edit script" or "rewrite".
-                
-             18. LOCAL FILE HANDLING:
-                - When user provides a local path (e.g., `c:\\path\\to\\video.mp4`):
-                  a. First call `upload_local_image(path)` to get a public URL.
-                  b. Then use that URL in subsequent operations.
-                - NEVER pass raw local paths to video generation.
-             """,
-             tools=[generate_video_segment, check_video_status, upload_local_image, execute_editor_script, run_daisychain_pipeline, extract_and_upload_last_frame, stitch_videos, add_background_music, overlay_text, extend_video_segment, advanced_voice_change, generate_manim_animation, overlay_foreground_video, generate_music_track, get_pipeline_manifest, update_segment_status, process_pipeline_manifest, edit_pipeline_manifest, set_current_run, approve_segment, lock_script, get_locked_script, resume_pipeline_run, get_session_status, edit_segment_prompt, reset_session]
-         )
-
+            instructions=_PRODUCER_INSTRUCTIONS,
+            tools=self._producer_tools
+        )
 
-        self.editor_agent = Agent(
+    @functools.cached_property
+    def editor_agent(self):
+        return Agent(
             name="Editor",
             model=self.logic_model,
-            instructions="""
-            You are a Video Editor specializing in MoviePy.
-            Your job is to write and execute Python scripts to edit videos.
-            
-            CAPABILITIES:
-            - Cut/Trim videos
-            - Concatenate clips
-            - Add text overlays
-            - Composite videos
-            - Adjust audio volume
-            - Add Music
-            - Create Data Visualizations (Manim)
-            - Overlay content
-            
-            RULES:
-            1. Use the `execute_editor_script` tool to run your code.
-            2. ALWAYS assume `from moviepy import *` or specific imports are needed. The script runs in a fresh process.
-               - **CRITICAL**: Use `from moviepy import ...`. DO NOT use `from moviepy.editor import ...`.
-            3. Handle file paths carefully. If a user provides a path, use it. If creating a new file, output to the current directory or a specific path if requested.
-            4. If the user request is vague, ask for clarification or propose a plan before writing code.
-            5. Since MoviePy v2.0 is used:
-               - Use `subclipped(start, end)` instead of `subclip`.
-               - Use `with_volume_scaled(factor)` instead of `volumex`.
-               - Use `with_duration(t)` instead of `set_duration`.
-               - Use `with_position(pos)` instead of `set_position`.
-               - `TextClip` needs a font installed or path to font file. Default to "Arial" or similar if unsure, or ask user.
-            6. SCRIPT SAVING: 
-               - If the user explicitly asks to save the script, or if the logic is reusable/complex, pass a descriptive name to `save_name` (e.g., "fade_in_effect").
-               - Otherwise, leave `save_name` empty (default) for ephemeral execution.
-            7. IMAGE EXPORT: If you extract a frame or create an image, ALWAYS print the absolute path of the output file in your script so it can be captured and used by other agents.
-            8. SHORTCUTS: Use the `add_background_music`, `overlay_text`, and `advanced_voice_change` tools for common tasks instead of writing raw scripts if possible.
-            9. MANIM: Use `generate_manim_animation` to create charts/graphs, then `overlay_foreground_video` to add them to a video.
-            10. MUSIC: Use `generate_music_track` to create music. The user must review it. Use `add_background_music` with the generated path.
-            """,
-            tools=[execute_editor_script, stitch_videos, add_background_music, overlay_text, advanced_voice_change, generate_manim_animation, overlay_foreground_video, generate_music_track]
+            instructions=_EDITOR_INSTRUCTIONS,
+            tools=self._editor_tools
         )
 
-        self.triage_agent = Agent(
+    @functools.cached_property
+    def triage_agent(self):
+        return Agent(
             name="Triage",
             model=self.logic_model,
-            instructions="""
-            You are the PROJECT COORDINATOR for Scorsese's legendary video studio.
-            
-            🎬 YOUR MISSION: Keep the production moving! Route requests to the right department.
-            
-            ROUTING RULES (in priority order):
-            
-            1. [Producer] - APPROVALS & PRODUCTION COMMANDS (HIGHEST PRIORITY):
-               Keywords: "approved", "looks good", "I like it", "nice", "good", "perfect", "yes", "ok", "let's go", "do it"
-               Keywords: "retry", "again", "redo", "try again", "one more time"
-               Keywords: "next", "next segment", "segment 2", "produce", "generate", "roll", "action"
-               Keywords: "stitch", "combine", "join", "final cut", "finish it", "wrap it up"
-               -> Send to Producer immediately.
-            
-            2. [Drafter] - NEW IDEAS & SCRIPTS:
-               Keywords: "make a video", "create", "I want", "talks about", "script about", "video where"
-               -> User has an IDEA that needs a script. Send to Drafter.
-               -> Even "Make a video about cats" needs drafting first.
-            
-            3. [Editor] - POST-PRODUCTION:
-               Keywords: "edit", "cut", "trim", "add text", "overlay", "music", "sound"
-               -> Technical editing work. Send to Editor.
-            
-            GOLDEN RULE: When in doubt about approval words, send to Producer.
-            
-            Examples:
-            "approved" -> Producer
-            "I like it" -> Producer  
-            "next" -> Producer
-            "stitch them" -> Producer
-            "make a video about crypto" -> Drafter
-            "edit the audio" -> Editor
-            """,
+            instructions=_TRIAGE_INSTRUCTIONS,
             handoffs=[self.drafter_agent, self.producer_agent, self.editor_agent]
         )
 
-    def _load_guide(self) -> str:
-        try:
-             with open(r"c:\Users\figon\zeebot\scorcese\AI Guide to Viral TikTok Scripts.txt", "r", encoding="utf-8") as f:
-                 return f.read()
-        except:
-            return "Use viral marketing principles."
+    @property
+    def _guide_prefix(self) -> str:
+        return self._guide_future.result()
+
+    @functools.cached_property
+    def _drafter_sys(self) -> str:
+        return _render("drafter", _DRAFTER_SYS_TMPL, self._guide_prefix)
+
+    @functools.cached_property
+    def _cached_system_blocks(self) -> list:
+        # The writer's system prompt never changes within a session; build it
+        # once and mark it cacheable so providers that support prompt caching
+        # (Anthropic via OpenRouter) only bill/process it in full on first use.
+        return [{
+            "type": "text",
+            "text": self._drafter_sys,
+            "cache_control": {"type": "ephemeral"}
+        }]
 
     def get_triage_agent(self):
         return self.triage_agent
@@ -3,7 +3,7 @@ import os
 import asyncio
 import argparse
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Optional
 from scorsese.services.kie_client import KIEClient
 # New modular agents system
 from scorsese.agents import ScorseseCrew
@@ -16,6 +16,18 @@ try:
 except ImportError:
     run_demo_loop = None
 
+# libuv-based event loop (Linux/macOS only); the stdlib loop otherwise
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def _run_async(coro):
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(coro)
+
 
 @dataclass
 class SessionState:
@@ -25,12 +37,20 @@ class SessionState:
     """
     current_run_id: Optional[str] = None
     approved_segments: dict = field(default_factory=dict)  # segment_index -> video_path
-    locked_script: Optional[str] = None  # JSON of the approved script
+    locked_script: Optional[Any] = None  # The approved script (parsed, or its JSON string)
     cleaned_audio_cache: dict = field(default_factory=dict)  # video_path -> {"url": cleaned_url, "local": local_path}
     
     # Default path for session persistence (in scorsese/output/)
     _session_file: str = field(default="scorsese/output/session_state.json", repr=False)
     
+    @property
+    def locked_script_json(self) -> Optional[str]:
+        """The locked script as a JSON string, serialized only when asked for."""
+        if self.locked_script is None or isinstance(self.locked_script, str):
+            return self.locked_script
+        import json
+        return json.dumps(self.locked_script)
+    
     def reset(self):
         """Clears all session state."""
         self.current_run_id = None
@@ -148,6 +168,7 @@ def main():
     kie = KIEClient(api_key=kie_api_key)
     
     # Import services for the crew
+    from scorsese.services.http_session import install_dns_cache
     from scorsese.services.moviepy_service import MoviePyService
     from scorsese.services.image_upload_service import ImageUploadService
     from scorsese.services.music_service import MusicService
@@ -157,6 +178,9 @@ def main():
     from scorsese.services.pipeline_service import PipelineService
     from scorsese.services.llm_client import LLMClient
     
+    # Uploads and KIE polls hit the same few hosts; resolve each once per TTL
+    install_dns_cache()
+    
     # Initialize services
     moviepy_service = MoviePyService()
     image_upload_service = ImageUploadService()
@@ -195,9 +219,11 @@ def main():
 
     # Allow CLI to default to interactive if no args or specific flag
     if args.interactive or len(sys.argv) == 1:
+        # Workers import MoviePy while the user types the first request
+        moviepy_service.prewarm()
         print("\n🎬 Starting Scorsese Studio...")
         print("   Director: Marty is ready to take your vision.")
-        asyncio.run(manual_loop(marty, session_state))
+        _run_async(manual_loop(marty, session_state))
     else:
         print("Use --interactive to start the studio.")
 
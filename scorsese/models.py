@@ -26,6 +26,12 @@ class ViralScript(BaseModel):
     def total_duration(self) -> float:
         return sum(s.duration_estimate for s in self.segments)
 
+# --- Pipeline Input Models ---
+
+class SegmentSpec(BaseModel):
+    prompt: str = Field(..., description="Video prompt for this segment")
+    mode: str = Field("normal", description="Generation mode: 'normal', 'fun' or 'spicy'")
+
 # --- Manifest Models ---
 from enum import Enum
 from typing import Union, Literal
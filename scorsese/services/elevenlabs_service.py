@@ -1,17 +1,34 @@
 import os
-import requests
 from io import BytesIO
 from elevenlabs.client import ElevenLabs
 import uuid
 
 class ElevenLabsService:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, http_client=None):
+        """
+        http_client: Optional httpx.Client to share a connection pool with the
+        other API clients (see llm_client.build_http_client).
+        """
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
         if not self.api_key:
             print("[ElevenLabsService] WARNING: No API Key provided. Voice changing will fail.")
             self.client = None
         else:
-            self.client = ElevenLabs(api_key=self.api_key)
+            self.client = ElevenLabs(api_key=self.api_key, httpx_client=http_client)
+        self._voices = {}  # voice_id -> voice metadata
+
+    def get_voice(self, voice_id: str):
+        """
+        Fetches (and remembers) the metadata for a voice. Raises if the key is
+        missing or the voice does not exist, so callers can validate a voice
+        before spending time on the rest of a pipeline.
+        """
+        if not self.client:
+            raise ValueError("ElevenLabs API Key missing.")
+        voice = self._voices.get(voice_id)
+        if voice is None:
+            voice = self._voices[voice_id] = self.client.voices.get(voice_id)
+        return voice
 
     def change_voice(self, audio_file_path: str, voice_id: str = "JBFqnCBsd6RMkjVDRZzb", output_path: str = None) -> str:
         """
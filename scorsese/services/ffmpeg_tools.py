@@ -0,0 +1,224 @@
+"""
+FFmpeg Tools
+
+Direct ffmpeg/ffprobe calls for edits that don't need MoviePy to decode and
+re-encode every frame: concatenating clips that already share codec settings,
+laying a music bed under a video, burning in text, pulling out or swapping the
+audio track and grabbing a clip's last frame. Each helper returns False (or None) when
+ffmpeg is missing or the fast path doesn't apply, so callers fall back to the
+MoviePy route.
+"""
+
+import os
+import re
+import json
+import shutil
+import tempfile
+import subprocess
+from typing import Any, Dict, List, Optional
+
+FFMPEG = shutil.which("ffmpeg")
+FFPROBE = shutil.which("ffprobe")
+FFMPEG_TIMEOUT = 300
+
+# drawtext needs an explicit font file; MoviePy's TextClip uses Arial, so look for it first
+_FONT_CANDIDATES = (
+    os.environ.get("SCORSESE_FONT_FILE"),
+    "C:/Windows/Fonts/arial.ttf",
+    "/Library/Fonts/Arial.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "/usr/share/fonts/truetype/msttcorefonts/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+)
+DRAWTEXT_FONT = next((p for p in _FONT_CANDIDATES if p and os.path.isfile(p)), None)
+
+# Stream properties that must match for the concat demuxer to copy safely
+_VIDEO_KEYS = ("codec_name", "profile", "width", "height", "pix_fmt", "r_frame_rate")
+_AUDIO_KEYS = ("codec_name", "sample_rate", "channels")
+
+
+def _run(args: List[str]) -> bool:
+    try:
+        result = subprocess.run(args, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"[ffmpeg] {e}")
+        return False
+    if result.returncode != 0:
+        print(f"[ffmpeg] exit {result.returncode}: {result.stderr[-500:]}")
+    return result.returncode == 0
+
+
+def probe_streams(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns {"video": {...}, "audio": {...} or None} with the properties that
+    decide stream-copy compatibility, or None if ffprobe is unavailable/fails.
+    """
+    if not FFPROBE:
+        return None
+    try:
+        result = subprocess.run(
+            [FFPROBE, "-v", "error", "-show_streams", "-of", "json", path],
+            capture_output=True, text=True, timeout=30
+        )
+        streams = json.loads(result.stdout).get("streams", [])
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        return None
+    info = {"video": None, "audio": None}
+    for stream in streams:
+        kind = stream.get("codec_type")
+        keys = _VIDEO_KEYS if kind == "video" else _AUDIO_KEYS if kind == "audio" else None
+        if keys and info[kind] is None:
+            info[kind] = {k: stream.get(k) for k in keys}
+    return info if info["video"] else None
+
+
+def concat_copy(video_paths: List[str], output_path: str) -> bool:
+    """
+    Concatenates clips with the concat demuxer and `-c copy` (no re-encode) when
+    every input has identical video/audio stream parameters.
+    """
+    if not FFMPEG or len(video_paths) < 2 or not all(os.path.exists(p) for p in video_paths):
+        return False
+    probes = [probe_streams(p) for p in video_paths]
+    if not probes[0] or any(p != probes[0] for p in probes[1:]):
+        return False
+
+    fd, list_path = tempfile.mkstemp(suffix=".txt", prefix="concat_")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for p in video_paths:
+                escaped = os.path.abspath(p).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        return _run([FFMPEG, "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", list_path,
+                     "-c", "copy", "-movflags", "+faststart", output_path])
+    finally:
+        try:
+            os.remove(list_path)
+        except OSError:
+            pass
+
+
+def add_music_copy_video(video_path: str, music_path: str, output_path: str, volume: float = 1.0) -> bool:
+    """
+    Puts a (looped/trimmed, volume-scaled) music track under a video. The video
+    stream is copied; only audio is encoded. If the video has its own audio the
+    two are summed with amix (normalize=0, like MoviePy's CompositeAudioClip),
+    so the loop/scale/mix runs in ffmpeg's native filters rather than MoviePy's
+    per-chunk Python audio pipeline.
+    """
+    if not FFMPEG:
+        return False
+    probe = probe_streams(video_path)
+    if not probe:
+        return False
+    if probe["audio"] is None:
+        audio_args = ["-map", "1:a", "-af", f"volume={volume}"]
+    else:
+        mix = f"[1:a]volume={volume}[music];[0:a][music]amix=inputs=2:duration=longest:normalize=0[aout]"
+        audio_args = ["-filter_complex", mix, "-map", "[aout]"]
+    return _run([FFMPEG, "-y", "-v", "error", "-i", video_path, "-stream_loop", "-1", "-i", music_path,
+                 "-map", "0:v", *audio_args, "-c:v", "copy", "-c:a", "aac", "-shortest", output_path])
+
+
+# MoviePy named positions -> drawtext x/y expressions (text centred horizontally)
+_DRAWTEXT_POSITIONS = {
+    "center": ("(w-text_w)/2", "(h-text_h)/2"),
+    "bottom": ("(w-text_w)/2", "h-text_h"),
+    "top": ("(w-text_w)/2", "0"),
+}
+
+
+# ffmpeg colour names, 0xRRGGBB / #RRGGBB, optional @alpha
+_DRAWTEXT_COLOR = re.compile(r"[A-Za-z0-9#.@]+\Z")
+
+
+def _filter_value(value: str) -> str:
+    # Quoted filtergraph option value. Values are unescaped twice (graph, then
+    # filter options), so ':' is sent as \: and "'" as \\\' between quotes.
+    return "'" + str(value).replace(":", "\\:").replace("'", "'\\\\\\''") + "'"
+
+
+def _filter_path(path: str) -> str:
+    # Path as a quoted filtergraph option value (Windows drive colons need escaping)
+    return _filter_value(path.replace("\\", "/"))
+
+
+def overlay_text(video_path: str, output_path: str, text: str, position: str = "bottom",
+                 color: str = "white", font_size: int = 50) -> bool:
+    """
+    Burns text into a video with the drawtext filter. The video is re-encoded
+    (veryfast preset) but the audio is copied, and there is no per-frame Python
+    compositing. The text goes through a temp file so it needs no escaping.
+    False (use MoviePy) if no font file was found or `color` isn't a plain
+    ffmpeg colour.
+    """
+    if not FFMPEG or not DRAWTEXT_FONT or position not in _DRAWTEXT_POSITIONS or not os.path.exists(video_path):
+        return False
+    if not _DRAWTEXT_COLOR.match(color):
+        return False
+    x, y = _DRAWTEXT_POSITIONS[position]
+
+    fd, text_path = tempfile.mkstemp(suffix=".txt", prefix="drawtext_")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        drawtext = (f"drawtext=fontfile={_filter_path(DRAWTEXT_FONT)}:textfile={_filter_path(text_path)}"
+                    f":fontsize={int(font_size)}:fontcolor={_filter_value(color)}"
+                    f":x={_filter_value(x)}:y={_filter_value(y)}")
+        return _run([FFMPEG, "-y", "-v", "error", "-i", video_path, "-vf", drawtext,
+                     "-c:v", "libx264", "-preset", "veryfast", "-c:a", "copy", output_path])
+    finally:
+        try:
+            os.remove(text_path)
+        except OSError:
+            pass
+
+
+def replace_audio(video_path: str, audio_path: str, output_path: str) -> bool:
+    """
+    Swaps a video's soundtrack for `audio_path`, copying the video stream and
+    encoding only the audio. Longer audio is cut at the video's end; shorter
+    audio is padded with silence (apad) so the video keeps its full length.
+    """
+    if not FFMPEG or not os.path.exists(video_path) or not os.path.exists(audio_path):
+        return False
+    return _run([FFMPEG, "-y", "-v", "error", "-i", video_path, "-i", audio_path,
+                 "-map", "0:v", "-map", "1:a", "-c:v", "copy", "-af", "apad", "-c:a", "aac",
+                 "-shortest", output_path])
+
+
+def extract_audio(video_path: str, output_path: str) -> bool:
+    """
+    Writes a video's audio track to `output_path` as MP3 (what KIE's isolation
+    endpoint expects). An MP3 track is stream-copied; anything else, or a copy
+    that fails, is encoded with libmp3lame. False if there is no audio track.
+    """
+    if not FFMPEG:
+        return False
+    probe = probe_streams(video_path)
+    if not probe or probe["audio"] is None:
+        return False
+
+    if probe["audio"]["codec_name"] == "mp3" and _run(
+            [FFMPEG, "-y", "-v", "error", "-i", video_path, "-vn", "-c:a", "copy", output_path]):
+        return True
+    if _run([FFMPEG, "-y", "-v", "error", "-i", video_path, "-vn", "-c:a", "libmp3lame", "-q:a", "2", output_path]):
+        return True
+    try:
+        os.remove(output_path)  # don't leave a partial file for the fallback to mistake for output
+    except OSError:
+        pass
+    return False
+
+
+def extract_last_frame(video_path: str, frame_path: str) -> bool:
+    """
+    Saves the final frame of a video by seeking relative to the end (-sseof),
+    so only the last fraction of a second is decoded instead of the whole clip.
+    """
+    if not FFMPEG or not os.path.exists(video_path):
+        return False
+    ok = _run([FFMPEG, "-y", "-v", "error", "-sseof", "-0.1", "-i", video_path,
+               "-frames:v", "1", "-q:v", "2", "-update", "1", frame_path])
+    return ok and os.path.exists(frame_path)
@@ -0,0 +1,208 @@
+"""
+Shared HTTP Session
+
+One keep-alive requests.Session with a pooled, retrying adapter. Uploads,
+downloads and API calls made through it reuse TCP/TLS connections instead of
+paying a DNS lookup + handshake on every request.
+"""
+
+import io
+import os
+import socket
+import time
+import threading
+import contextlib
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.retry import Retry
+
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+
+# (connect, read) seconds. Every request gets an explicit timeout so a stalled
+# host raises instead of hanging the pipeline; task-status polls use a shorter
+# read timeout so the backoff loop can simply retry.
+HTTP_TIMEOUT = (5, 30)
+POLL_TIMEOUT = (5, 10)
+
+DOWNLOAD_CHUNK = 64 * 1024
+DOWNLOAD_BUFFER = 1024 * 1024
+
+
+def _build_adapter(cls=HTTPAdapter) -> HTTPAdapter:
+    return cls(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.5)
+    )
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = _build_adapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _build_session()
+
+
+def _post_multipart(url: str, field: str, filename: str, fileobj, content_type: str, **kwargs) -> requests.Response:
+    headers = dict(kwargs.pop("headers", None) or {})
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    if MultipartEncoder is None:
+        return SESSION.post(url, files={field: (filename, fileobj, content_type)}, headers=headers, **kwargs)
+    m = MultipartEncoder(fields={field: (filename, fileobj, content_type)})
+    headers["Content-Type"] = m.content_type
+    return SESSION.post(url, data=m, headers=headers, **kwargs)
+
+
+def post_file(url: str, path: str, field: str = "file", **kwargs) -> requests.Response:
+    """
+    POSTs a local file as multipart/form-data through the shared session.
+    With requests_toolbelt installed the body is streamed from disk in chunks
+    rather than assembled in memory; otherwise falls back to `files=`.
+    """
+    with open(path, "rb") as f:
+        return _post_multipart(url, field, os.path.basename(path), f, "application/octet-stream", **kwargs)
+
+
+def post_bytes(url: str, filename: str, payload: bytes, field: str = "file",
+               content_type: str = "application/octet-stream", **kwargs) -> requests.Response:
+    """POSTs an in-memory payload as a multipart file field, without touching disk."""
+    return _post_multipart(url, field, filename, io.BytesIO(payload), content_type, **kwargs)
+
+
+@contextlib.contextmanager
+def open_download(fpath: str, size=None):
+    """
+    Opens a download target with a large write buffer (one write syscall per
+    ~1 MiB instead of per chunk) and, when the size is known, reserves the
+    blocks up front so the file isn't extended on every write.
+    """
+    with open(fpath, 'wb', buffering=DOWNLOAD_BUFFER) as f:
+        if size and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, int(size))
+            except (OSError, ValueError):
+                pass
+        yield f
+        # Drop any reserved space the body didn't fill (e.g. a short read)
+        f.truncate()
+
+
+def download_file(url: str, fpath: str):
+    """Streams `url` to `fpath` through the shared session. Raises on HTTP errors."""
+    with SESSION.get(url, stream=True, timeout=HTTP_TIMEOUT) as r:
+        r.raise_for_status()
+        with open_download(fpath, r.headers.get("Content-Length")) as f:
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK):
+                f.write(chunk)
+
+
+# --- DNS cache ---
+#
+# Scoped to the pools of a session that opts in via install_dns_cache(): only
+# new connections those pools open look the host up through this cache, and
+# socket.getaddrinfo itself is left alone for every other library.
+
+_DNS_CACHE_SIZE = 128
+_dns_cache = {}  # (host, port) -> (expiry, ip), oldest insertion first
+_dns_lock = threading.Lock()
+_dns_ttl = 300.0
+
+
+def _cached_ip(host: str, port: int) -> str:
+    """First address getaddrinfo gives for (host, port), reused for `_dns_ttl` seconds."""
+    key = (host, port)
+    now = time.monotonic()
+    with _dns_lock:
+        entry = _dns_cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+    ip = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)[0][4][0]
+    with _dns_lock:
+        _dns_cache.pop(key, None)
+        if len(_dns_cache) >= _DNS_CACHE_SIZE:
+            _dns_cache.pop(next(iter(_dns_cache)))
+        _dns_cache[key] = (now + _dns_ttl, ip)
+    return ip
+
+
+def _forget_ip(host: str, port: int):
+    with _dns_lock:
+        _dns_cache.pop((host, port), None)
+
+
+class _CachedDNSMixin:
+    """
+    Connects to the cached address instead of resolving the host again.
+    urllib3 only reads `_dns_host` while opening the socket; `host` (SNI,
+    certificate checks, Host header) is the real name again once this returns.
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            ip = _cached_ip(host, self.port)
+        except OSError:
+            return super()._new_conn()  # let urllib3 raise its usual error
+        self._dns_host = ip
+        try:
+            return super()._new_conn()
+        except Exception:
+            _forget_ip(host, self.port)  # host may have moved; re-resolve next time
+            raise
+        finally:
+            self._dns_host = host
+
+
+class _CachedDNSHTTPConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSHTTPConnection
+
+
+class _CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+class _CachedDNSAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CachedDNSHTTPConnectionPool,
+            "https": _CachedDNSHTTPSConnectionPool,
+        }
+
+
+def install_dns_cache(session: requests.Session = None, ttl: float = 300.0):
+    """
+    Makes `session` (default: the shared SESSION) resolve each host at most
+    once per `ttl` seconds. Call once at startup; safe to call more than once.
+    """
+    global _dns_ttl
+    _dns_ttl = ttl
+    session = session or SESSION
+    old = [a for a in session.adapters.values() if not isinstance(a, _CachedDNSAdapter)]
+    if not old:
+        return
+    adapter = _build_adapter(_CachedDNSAdapter)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    for a in old:
+        a.close()
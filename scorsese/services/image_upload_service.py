@@ -1,14 +1,54 @@
-import requests
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .http_session import post_file
+
+# Shared across instances so a slow upload that was hedged can finish in the
+# background without blocking the caller that already has its URL.
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="upload")
+
+# Seconds an upload gets before the next host is tried alongside it
+UPLOAD_HEDGE_DELAY = 10.0
 
 class ImageUploadService:
     def __init__(self):
-        # Uguu.se (Primary), file.io (Fallback)
+        # Uguu.se first, tmpfiles.org if it fails or stalls; file.io only as a
+        # last resort, since its links expire after a single download
         self.upload_url = "https://uguu.se/upload.php"
+        self.providers = [self._upload_uguu, self._upload_tmpfiles]
+        self.last_resort = self._upload_fileio
+
+    def _upload_uguu(self, file_path: str) -> str:
+        # Uguu requires 'files[]' key
+        response = post_file(self.upload_url, file_path, field='files[]')
+        if response.status_code != 200:
+            raise Exception(f"Uguu status: {response.status_code}")
+        data = response.json()
+        if not data.get("success"):
+            raise Exception(f"Uguu error: {data}")
+        return data["files"][0]["url"]
+
+    def _upload_fileio(self, file_path: str) -> str:
+        response = post_file('https://file.io', file_path, headers={"Accept": "application/json"})
+        if response.status_code != 200:
+            raise Exception(f"file.io status: {response.status_code}")
+        link = response.json().get('link')
+        if not link:
+            raise Exception(f"file.io returned no link: {response.text[:200]}")
+        return link
+
+    def _upload_tmpfiles(self, file_path: str) -> str:
+        response = post_file("https://tmpfiles.org/api/v1/upload", file_path)
+        if response.status_code != 200:
+            raise Exception(f"tmpfiles status: {response.status_code}")
+        page_url = response.json()['data']['url']
+        # Page URL -> direct download URL, forced to HTTPS (KIE rejects plain http)
+        return page_url.replace("tmpfiles.org/", "tmpfiles.org/dl/").replace("http://", "https://")
 
     def upload_image(self, file_path: str) -> str:
         """
-        Uploads a local file to Uguu.se and returns the public URL.
+        Uploads a local file and returns a public URL. Providers are tried in
+        order; the next one starts when the current one fails or has run for
+        UPLOAD_HEDGE_DELAY seconds, and the first good URL wins.
         If the input is already a URL, returns it as-is.
         """
         if file_path.startswith("http://") or file_path.startswith("https://"):
@@ -17,39 +57,39 @@ class ImageUploadService:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        # Try Uguu.se
+        queue = list(self.providers)
+        pending = {}
+        done = set()
+        errors = []
+        while queue or pending:
+            # Start the next host if nothing is running or the last wait timed out
+            if queue and (not pending or not done):
+                provider = queue.pop(0)
+                pending[_UPLOAD_POOL.submit(provider, file_path)] = provider.__name__
+            done, _ = wait(pending, timeout=UPLOAD_HEDGE_DELAY if queue else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    url = future.result()
+                except Exception as e:
+                    errors.append(f"{name}: {e}")
+                    continue
+                if url:
+                    for other in pending:
+                        other.cancel()
+                    return url
+                errors.append(f"{name}: empty URL")
+
         try:
-            with open(file_path, 'rb') as f:
-                # Uguu requires 'files[]' key
-                files = {'files[]': f}
-                response = requests.post(self.upload_url, files=files)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        return data["files"][0]["url"]
-                    else:
-                        raise Exception(f"Uguu error: {data}")
-                else:
-                    raise Exception(f"Uguu status: {response.status_code}")
-                    
+            url = self.last_resort(file_path)
+            if url:
+                return url
+            errors.append(f"{self.last_resort.__name__}: empty URL")
         except Exception as e:
-            print(f"[ImageUploadService] Uguu failed ({e}). Trying file.io...")
-            # Fallback to file.io (using curl if possible or simplistic requests?)
-            # We'll stick to requests for potential cross-platform support, 
-            # even though it failed in debug, it's better than nothing.
-            try:
-                with open(file_path, 'rb') as f:
-                     # file.io might work if we interpret response as text/html for link?
-                     # No, let's just stick to the basic attempt.
-                     response = requests.post('https://file.io', files={'file': f})
-                     if response.status_code == 200:
-                         # Try parsing JSON, otherwise fallback to text?
-                         try:
-                             return response.json().get('link')
-                         except:
-                             pass
-            except:
-                pass
-            
-            raise Exception(f"All upload providers failed. Primary error: {e}")
+            errors.append(f"{self.last_resort.__name__}: {e}")
+
+        print(f"[ImageUploadService] All providers failed: {errors}")
+        raise Exception(f"All upload providers failed: {'; '.join(errors)}")
+
+    # CinematographerTools calls `upload(...)`
+    upload = upload_image
@@ -0,0 +1,54 @@
+"""
+JSON I/O helpers
+
+Uses orjson when it is installed (several times faster than the stdlib on
+dict-heavy manifests) and falls back to json otherwise. Writes go to a temp
+file in the same directory, are fsynced, then os.replace'd over the target so
+readers never see a half-written file.
+"""
+
+import os
+import json
+import tempfile
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serializes `obj` as 2-space indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def loads(data) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: str) -> Any:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_json_atomic(path: str, obj: Any):
+    """Writes `obj` to `path` via temp file + fsync + os.replace."""
+    data = dumps(obj)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
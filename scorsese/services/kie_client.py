@@ -2,7 +2,24 @@ import os
 import requests
 import json
 import time
-from typing import Optional, List, Dict, Any, Union
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Union, Iterator
+from .http_session import SESSION, HTTP_TIMEOUT, POLL_TIMEOUT
+
+STATUS_BATCH_WORKERS = 8
+
+
+def poll_backoff(min_s: float = 1.0, max_s: float = 15.0, rate: float = 1.5) -> Iterator[float]:
+    """
+    Yields sleep intervals for status polling: starts at min_s and grows by `rate`
+    after each non-terminal poll, capped at max_s.
+    """
+    delay = min_s
+    while True:
+        yield delay
+        delay = min(max_s, delay * rate)
+
 
 class KIEClient:
     BASE_URL = "https://api.kie.ai"
@@ -20,7 +37,7 @@ class KIEClient:
     def _post(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         url = f"{self.BASE_URL}{endpoint}"
         try:
-            response = requests.post(url, headers=self.headers, data=json.dumps(payload))
+            response = SESSION.post(url, headers=self.headers, data=json.dumps(payload), timeout=HTTP_TIMEOUT)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
@@ -34,7 +51,7 @@ class KIEClient:
     def _get(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         url = f"{self.BASE_URL}{endpoint}"
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = SESSION.get(url, headers=self.headers, params=params, timeout=POLL_TIMEOUT)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
@@ -175,22 +192,65 @@ class KIEClient:
         
         return result_info
 
-    def wait_for_task(self, task_id: str, poll_interval: int = 5, timeout: int = 120) -> Dict[str, Any]:
+    def get_task_statuses(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        get_task_status for several tasks at once. KIE has no multi-task status
+        endpoint, so the requests are issued concurrently over the shared
+        keep-alive session. A task whose request raised gets state "error".
+        """
+        def _one(task_id: str) -> Dict[str, Any]:
+            try:
+                return self.get_task_status(task_id)
+            except Exception as e:
+                return {"state": "error", "taskId": task_id, "msg": str(e)}
+
+        task_ids = list(dict.fromkeys(task_ids))
+        if len(task_ids) <= 1:
+            return {t: _one(t) for t in task_ids}
+        with ThreadPoolExecutor(max_workers=min(STATUS_BATCH_WORKERS, len(task_ids)), thread_name_prefix="kie-status") as ex:
+            return dict(zip(task_ids, ex.map(_one, task_ids)))
+
+    def wait_for_task(self, task_id: str, poll_interval: float = 1.0, timeout: int = 120,
+                      max_interval: float = 15.0, backoff: float = 1.5) -> Dict[str, Any]:
         """
         Helper to synchronously wait for a task to complete.
+        Polls with exponential backoff (poll_interval -> max_interval), bounded by
+        `timeout` seconds of wall time.
         """
-        start_time = time.time()
-        while True:
+        deadline = time.monotonic() + timeout
+        for delay in poll_backoff(poll_interval, max_interval, backoff):
             status = self.get_task_status(task_id)
             state = status.get("state")
             
             if state in ["success", "fail"]:
                 return status
             
-            if time.time() - start_time > timeout:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Task {task_id} timed out after {timeout} seconds")
+            
+            time.sleep(min(delay, remaining))
+
+    async def wait_for_task_async(self, task_id: str, poll_interval: float = 1.0, timeout: int = 120,
+                                  max_interval: float = 10.0, backoff: float = 1.5) -> Dict[str, Any]:
+        """
+        Async counterpart of wait_for_task: same backoff schedule, but waits with
+        asyncio.sleep and runs each status request in a worker thread, so the
+        event loop keeps serving other tool calls while the task runs.
+        """
+        deadline = time.monotonic() + timeout
+        for delay in poll_backoff(poll_interval, max_interval, backoff):
+            status = await asyncio.to_thread(self.get_task_status, task_id)
+            state = status.get("state")
+            
+            if state in ["success", "fail"]:
+                return status
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 raise TimeoutError(f"Task {task_id} timed out after {timeout} seconds")
             
-            time.sleep(poll_interval)
+            await asyncio.sleep(min(delay, remaining))
 
     def isolate_audio(self, audio_url: str, callback_url: Optional[str] = None) -> str:
         """
@@ -254,13 +314,14 @@ class KIEClient:
             
         return result_info
 
-    def wait_for_music(self, task_id: str, poll_interval: int = 5, timeout: int = 300) -> Dict[str, Any]:
+    def wait_for_music(self, task_id: str, poll_interval: float = 5.0, timeout: int = 300,
+                       max_interval: float = 15.0, backoff: float = 1.5) -> Dict[str, Any]:
         """
         Waits for a SUNO MUSIC task to complete.
-        Uses the Suno-specific status endpoint.
+        Uses the Suno-specific status endpoint, polling with exponential backoff.
         """
-        start_time = time.time()
-        while True:
+        deadline = time.monotonic() + timeout
+        for delay in poll_backoff(poll_interval, max_interval, backoff):
             status = self.get_music_status(task_id)
             current_status = status.get("status", "PENDING")
             
@@ -277,10 +338,11 @@ class KIEClient:
                 return status
             
             # Timeout
-            if time.time() - start_time > timeout:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 raise TimeoutError(f"Suno task {task_id} timed out after {timeout} seconds (status: {current_status})")
             
-            time.sleep(poll_interval)
+            time.sleep(min(delay, remaining))
 
     def generate_music(self, prompt: str, instrumental: bool = True, model: str = "V5") -> str:
         """
@@ -1,11 +1,53 @@
 import os
 import json
-from typing import List, Dict, Any, Optional, Type
+from typing import List, Dict, Any, Optional, Type, Union
+import httpx
 from pydantic import BaseModel
 from openai import OpenAI
 
+try:
+    import h2  # enables HTTP/2 in httpx
+except ImportError:
+    h2 = None
+
+SystemPrompt = Union[str, List[Dict[str, Any]]]
+
+
+def _supports_cache_control(model: str) -> bool:
+    """Anthropic models (directly or via OpenRouter) honour per-block cache_control."""
+    model = model.lower()
+    return "anthropic" in model or "claude" in model
+
+
+def _system_message(system_prompt: SystemPrompt, model: str) -> Dict[str, Any]:
+    """
+    Builds the system message. `system_prompt` may be a plain string or a list
+    of text content blocks; blocks keep their cache_control markers for models
+    that support prompt caching and are flattened to a string for the rest.
+    """
+    if isinstance(system_prompt, str):
+        return {"role": "system", "content": system_prompt}
+    if _supports_cache_control(model):
+        return {"role": "system", "content": system_prompt}
+    return {"role": "system", "content": "\n\n".join(block["text"] for block in system_prompt)}
+
+
+def build_http_client() -> httpx.Client:
+    """
+    Keep-alive connection pool that several LLMClients can share, so creative
+    and speech calls reuse TLS connections (multiplexed over HTTP/2 when h2 is
+    installed) instead of each client keeping its own pool.
+    """
+    return httpx.Client(
+        http2=h2 is not None,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=httpx.Timeout(600.0, connect=5.0)
+    )
+
+
 class LLMClient:
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, model: str = "gpt-4o"):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, model: str = "gpt-4o",
+                 http_client: Optional[httpx.Client] = None):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY") or os.getenv("OPENROUTER_API_KEY")
         self.base_url = base_url or os.getenv("OPENAI_BASE_URL") or "https://openrouter.ai/api/v1"
         self.model = model
@@ -20,7 +62,8 @@ class LLMClient:
             default_headers={
                 "HTTP-Referer": "https://github.com/scorsese/scorsese", # Optional
                 "X-Title": "Scorsese" 
-            }
+            },
+            http_client=http_client
         )
 
     def generate_completion(self, prompt: str, system_prompt: str = "You are a helpful assistant.") -> str:
@@ -33,16 +76,18 @@ class LLMClient:
         )
         return response.choices[0].message.content
 
-    def generate_creative_completion(self, prompt: str, system_prompt: str, model: Optional[str] = None, **kwargs) -> str:
+    def generate_creative_completion(self, prompt: str, system_prompt: SystemPrompt, model: Optional[str] = None, **kwargs) -> str:
         """
         Generates creative content potentially using a different model (e.g. via OpenRouter).
+        `system_prompt` may be a list of content blocks marked with
+        cache_control so a large static prefix is served from the prompt cache.
         """
         target_model = model or self.model
         try:
             params = {
                 "model": target_model,
                 "messages": [
-                    {"role": "system", "content": system_prompt},
+                    _system_message(system_prompt, target_model),
                     {"role": "user", "content": prompt}
                 ],
                 "temperature": 0.8, # Default, can be overridden
@@ -1,11 +1,15 @@
 import os
+import shutil
+import hashlib
 import subprocess
 import uuid
 
 class ManimService:
-    def __init__(self, output_dir: str = "scorsese/output"):
+    def __init__(self, output_dir: str = "scorsese/output", cache_dir: str = "scorsese/cache/manim"):
         self.output_dir = output_dir
+        self.cache_dir = cache_dir
         os.makedirs(self.output_dir, exist_ok=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
         # Manim generates media locally, we'll need to find where it puts it.
         # Default: media/videos/{file_name}/{quality}/{scene_name}.mp4
 
@@ -14,7 +18,15 @@ class ManimService:
         Writes the script to a temp file and runs Manim.
         Quality options: 'l' (480p), 'm' (720p), 'h' (1080p), 'k' (4k).
         Returns the absolute path to the generated MP4 file.
+        Renders are cached by (script, scene, quality), so asking for the same
+        animation again returns the earlier file without re-rendering.
         """
+        key = hashlib.sha256(f"{quality}\0{scene_name}\0{script_code}".encode("utf-8")).hexdigest()[:16]
+        cached_path = os.path.join(self.cache_dir, f"{key}.mp4")
+        if os.path.exists(cached_path):
+            print(f"[Manim] Using cached render for {scene_name}: {cached_path}")
+            return os.path.abspath(cached_path)
+
         # 1. Write Script to Temp File
         file_name = f"manim_script_{uuid.uuid4().hex[:6]}"
         script_path = f"{file_name}.py"
@@ -65,12 +77,10 @@ class ManimService:
             if not os.path.exists(output_file):
                 raise FileNotFoundError(f"Could not locate generated Manim video at {output_file}")
                 
-            # 4. Move to scorsese/output for cleaner access
-            final_path = os.path.join(self.output_dir, f"{scene_name}_{uuid.uuid4().hex[:6]}.mp4")
-            import shutil
-            shutil.copy(output_file, final_path)
+            # 4. Copy into the render cache, which is also the returned location
+            shutil.copy(output_file, cached_path)
             
-            return os.path.abspath(final_path)
+            return os.path.abspath(cached_path)
 
         finally:
             # Cleanup temp script
@@ -1,18 +1,67 @@
-import sys
-import subprocess
 import tempfile
 import os
 import uuid
+import multiprocessing
+
+from .script_pool import get_script_pool
+from . import ffmpeg_tools
+
+SCRIPT_TIMEOUT = 300
+
+
+def _format_log(header: str, stdout: str, stderr: str, returncode: int) -> str:
+    output = f"{header}--- STDOUT ---\n{stdout}\n\n--- STDERR ---\n{stderr}"
+    if returncode != 0:
+        output += f"\n\nEXIT CODE: {returncode}"
+    return output
+
 
 class MoviePyService:
     def __init__(self):
         pass
 
+    def prewarm(self):
+        """Spins up the ScriptPool workers ahead of the first edit."""
+        get_script_pool().start()
+
+    def run_template(self, name: str, **kwargs) -> str:
+        """
+        Runs one of the fixed edits in moviepy_templates in its own warm
+        ScriptPool worker, passing parameters as values rather than splicing them into
+        generated source. Returns a log in the same format as run_script.
+        """
+        try:
+            result = get_script_pool().run_template(name, kwargs, os.getcwd(), SCRIPT_TIMEOUT)
+        except multiprocessing.TimeoutError:
+            return f"Error: Template '{name}' timed out after {SCRIPT_TIMEOUT} seconds."
+        except Exception as e:
+            return f"Error executing template '{name}': {str(e)}"
+        return _format_log("", result["stdout"], result["stderr"], result["returncode"])
+
+    def extract_last_frame(self, video_path: str, output_path: str = None) -> str:
+        """
+        Saves the last frame of `video_path` as an image and returns its path.
+        Uses an ffmpeg end-seek when available (decodes ~0.1 s instead of the
+        whole clip) and falls back to MoviePy. Raises if no frame was written.
+        """
+        if not output_path:
+            output_path = os.path.join(os.getcwd(), "scorsese", f"frame_{uuid.uuid4().hex[:6]}.png")
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        if ffmpeg_tools.extract_last_frame(video_path, output_path):
+            return output_path
+
+        log = self.run_template("save_last_frame", video_path=video_path, output_path=output_path)
+        if not os.path.exists(output_path):
+            raise RuntimeError(f"Frame extraction failed. Log: {log}")
+        return output_path
+
     def run_script(self, script_code: str, save_name: str = None) -> str:
         """
-        Executes the provided Python script code.
-        If save_name is provided, saves the script to 'scorsese/scripts/{save_name}.py'.
-        Otherwise, uses a temporary file and deletes it after execution.
+        Executes the provided Python script code in a warm ScriptPool worker
+        (moviepy already imported) instead of a fresh interpreter.
+        If save_name is provided, also saves the script to 'scorsese/scripts/{save_name}.py'.
+        Otherwise nothing is written to disk.
         """
         if save_name:
             if not save_name.endswith(".py"):
@@ -25,43 +74,21 @@ class MoviePyService:
             scripts_dir = os.path.join(os.getcwd(), "scorsese", "scripts")
             os.makedirs(scripts_dir, exist_ok=True)
             filepath = os.path.join(scripts_dir, save_name)
-            should_cleanup = False
-            
             output_header = f"[Script saved to: {filepath}]\n"
         else:
-            # Temporary file
-            filename = f"temp_moviepy_script_{uuid.uuid4()}.py"
-            temp_dir = tempfile.gettempdir()
-            filepath = os.path.join(temp_dir, filename)
-            should_cleanup = True
+            # Only used as the code object's filename in tracebacks
+            filepath = os.path.join(tempfile.gettempdir(), f"temp_moviepy_script_{uuid.uuid4()}.py")
             output_header = ""
 
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(script_code)
+            if save_name:
+                with open(filepath, "w", encoding="utf-8") as f:
+                    f.write(script_code)
 
-            # Execute the script
-            result = subprocess.run(
-                [sys.executable, filepath],
-                capture_output=True,
-                text=True,
-                timeout=300 
-            )
-            
-            output = f"{output_header}--- STDOUT ---\n{result.stdout}\n\n--- STDERR ---\n{result.stderr}"
-            if result.returncode != 0:
-                output += f"\n\nEXIT CODE: {result.returncode}"
-            
-            return output
+            result = get_script_pool().run(script_code, filepath, os.getcwd(), SCRIPT_TIMEOUT)
+            return _format_log(output_header, result["stdout"], result["stderr"], result["returncode"])
 
-        except subprocess.TimeoutExpired:
-            return "Error: Script execution timed out after 300 seconds."
+        except multiprocessing.TimeoutError:
+            return f"Error: Script execution timed out after {SCRIPT_TIMEOUT} seconds."
         except Exception as e:
             return f"Error executing script: {str(e)}"
-        finally:
-            # Clean up only if it was a temp file
-            if should_cleanup and os.path.exists(filepath):
-                try:
-                    os.remove(filepath)
-                except:
-                    pass
@@ -0,0 +1,144 @@
+"""
+MoviePy Templates
+
+The fixed edits the agent tools perform (music bed, text overlay, audio
+extract/merge, video overlay, last frame, stitching), written once as plain
+functions instead of being re-rendered as script source on every call. Each call
+runs in its own pre-warmed ScriptPool worker via MoviePyService.run_template (a
+hung template is killed on timeout without touching other edits), and prints
+the same SUCCESS/ERROR markers the old generated scripts did so callers can
+keep scanning the log.
+"""
+
+import os
+
+from moviepy import (VideoFileClip, AudioFileClip, CompositeAudioClip, TextClip, CompositeVideoClip,
+                     concatenate_videoclips, vfx, afx)
+
+
+def add_music(video_path: str, music_path: str, output_path: str, volume: float):
+    try:
+        video = VideoFileClip(video_path)
+        music = AudioFileClip(music_path).with_volume_scaled(volume)
+
+        # Loop music if shorter than video, or trim if longer
+        if music.duration < video.duration:
+            music = music.with_effects([afx.AudioLoop(duration=video.duration)])
+        else:
+            music = music.subclipped(0, video.duration)
+
+        # Mix with original video audio if it exists
+        original_audio = video.audio
+        if original_audio:
+            final_audio = CompositeAudioClip([original_audio, music])
+        else:
+            final_audio = music
+
+        final_video = video.with_audio(final_audio)
+        final_video.write_videofile(output_path, codec="libx264", audio_codec="aac")
+        print(f"MUSIC_SUCCESS: {output_path}")
+
+    except Exception as e:
+        print(f"MUSIC_ERROR: {e}")
+
+
+def overlay_text(video_path: str, output_path: str, text: str, position: str, color: str, font_size: int):
+    try:
+        video = VideoFileClip(video_path)
+
+        # Note: MoviePy v2 requirements for TextClip can be tricky with fonts.
+        txt_clip = TextClip(font="Arial", text=text, font_size=font_size, color=color)
+        txt_clip = txt_clip.with_position(position).with_duration(video.duration)
+
+        final_video = CompositeVideoClip([video, txt_clip])
+        final_video.write_videofile(output_path, codec="libx264", audio_codec="aac")
+
+        print(f"OVERLAY_SUCCESS: {output_path}")
+
+    except Exception as e:
+        print(f"OVERLAY_ERROR: {e}")
+
+
+def extract_audio(video_path: str, output_path: str):
+    try:
+        with VideoFileClip(video_path) as clip:
+            if clip.audio:
+                clip.audio.write_audiofile(output_path)
+                print(f"AUDIO_EXTRACTED: {output_path}")
+            else:
+                print("NO_AUDIO_FOUND")
+    except Exception as e:
+        print(f"EXTRACT_ERROR: {e}")
+
+
+def merge_audio(video_path: str, audio_path: str, output_path: str):
+    try:
+        video = VideoFileClip(video_path)
+        audio = AudioFileClip(audio_path)
+
+        # Trim audio to video duration if needed
+        if audio.duration > video.duration:
+            audio = audio.subclipped(0, video.duration)
+
+        final = video.with_audio(audio)
+        final.write_videofile(output_path, codec="libx264", audio_codec="aac")
+        print(f"MERGE_SUCCESS: {output_path}")
+    except Exception as e:
+        print(f"MERGE_ERROR: {e}")
+
+
+def overlay_video(background_video: str, foreground_video: str, output_path: str, position: str, scale: float):
+    try:
+        bg = VideoFileClip(background_video)
+        fg = VideoFileClip(foreground_video)
+
+        fg = fg.resized(scale=scale).with_position(position)
+
+        # Simple Luma Key for Manim (Black Background -> Transparent)
+        fg = fg.with_effects([vfx.MaskColor(color=[0, 0, 0], threshold=10, stiffness=5)])
+
+        # Plays the foreground once on top of the background
+        final = CompositeVideoClip([bg, fg])
+
+        final.write_videofile(output_path, codec="libx264", audio_codec="aac")
+        print(f"OVERLAY_SUCCESS: {output_path}")
+
+    except Exception as e:
+        print(f"OVERLAY_ERROR: {e}")
+
+
+def save_last_frame(video_path: str, output_path: str):
+    try:
+        with VideoFileClip(video_path) as clip:
+            clip.save_frame(output_path, t=clip.duration - 0.1)
+        print(f"FRAME_SAVED: {output_path}")
+    except Exception as e:
+        print(f"FRAME_ERROR: {e}")
+
+
+def stitch(video_paths: list, output_path: str):
+    clips = []
+    try:
+        for path in video_paths:
+            if os.path.exists(path):
+                clips.append(VideoFileClip(path))
+            else:
+                print(f"WARNING: File not found: {path}")
+
+        if not clips:
+            print("NO_CLIPS_LOADED")
+            return
+
+        final_clip = concatenate_videoclips(clips, method="compose")
+        final_clip.write_videofile(output_path, codec="libx264", audio_codec="aac")
+        print(f"STITCH_SUCCESS: {output_path}")
+
+    except Exception as e:
+        print(f"STITCH_ERROR: {e}")
+    finally:
+        # Release file handles
+        for clip in clips:
+            try:
+                clip.close()
+            except Exception:
+                pass
@@ -1,18 +1,37 @@
 import os
 import time
-import requests
+import tempfile
+from .http_session import download_file
+from .ttl_cache import TTLCache, cache_key
 from typing import Optional
 
+MUSIC_CACHE_TTL = 7 * 24 * 3600
+
 class MusicService:
     def __init__(self, kie_client=None):
         self.kie = kie_client
+        self.music_cache = TTLCache(os.path.join(tempfile.gettempdir(), "scorsese_music_cache"), MUSIC_CACHE_TTL)
 
     def generate_music(self, prompt: str, instrumental: bool = True) -> str:
         """
         Generates music via KIE (Suno).
         Waits for completion and downloads the result (first clip).
         Returns path to the downloaded MP3.
+        Repeated requests for the same (prompt, instrumental) reuse the earlier
+        download while it still exists.
         """
+        key = cache_key(prompt, instrumental)
+        cached = self.music_cache.get(key)
+        if cached and os.path.exists(cached):
+            print(f"[MusicService] Reusing cached track for '{prompt}': {cached}")
+            return cached
+
+        path = self._generate_music(prompt, instrumental)
+        if path:
+            self.music_cache.set(key, os.path.abspath(path))
+        return path
+
+    def _generate_music(self, prompt: str, instrumental: bool) -> Optional[str]:
         if not self.kie:
             print("[MusicService] No KIE Client provided. Cannot generate music.")
             return None
@@ -91,13 +110,9 @@ class MusicService:
         os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, filename)
         
-        response = requests.get(music_url)
-        if response.status_code == 200:
-            with open(output_path, "wb") as f:
-                f.write(response.content)
-            return output_path
-        else:
-            raise Exception(f"Failed to download music: {response.status_code}")
+        # Streamed through the shared keep-alive session; raises on HTTP errors
+        download_file(music_url, output_path)
+        return output_path
 
     def get_local_music(self, path: str) -> str:
         """
@@ -1,27 +1,31 @@
 import os
-import json
 import uuid
+from typing import Any, Dict, List, Union
+from . import ffmpeg_tools
+from .jsonio import loads, read_json, write_json_atomic
 
 class PipelineService:
     def __init__(self, video_service, moviepy_service):
         self.video_service = video_service
         self.moviepy_service = moviepy_service
 
-    def run_daisychain(self, segments_json: str, initial_image_url: str = None) -> str:
+    def run_daisychain(self, segments: Union[str, List[Dict[str, Any]]], initial_image_url: str = None) -> str:
         """
         Initializes a new Daisychain Run.
         Creates a Manifest and starts processing (Segment 1 only).
+        `segments` is a list of {"prompt", "mode"} dicts (or the same as a JSON string).
         """
-        import json
         import time
         
-        try:
-            segments_list = json.loads(segments_json)
-        except:
-            return "Error: segments_json must be a valid JSON string."
+        segments_list = segments
+        if isinstance(segments, str):
+            try:
+                segments_list = loads(segments)
+            except ValueError:
+                return "Error: segments must be a valid JSON string."
             
         if not isinstance(segments_list, list):
-            return "Error: segments_json must be a list of dicts."
+            return "Error: segments must be a list of dicts."
             
         # Create Run ID
         run_id = uuid.uuid4().hex[:8]
@@ -54,8 +58,7 @@ class PipelineService:
         manifest_path = os.path.join(os.getcwd(), "scorsese", "output", f"manifest_{run_id}.json")
         os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
         
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest_data, f, indent=2)
+        write_json_atomic(manifest_path, manifest_data)
             
         print(f"[Pipeline] Created Run {run_id}. Starting Segment 1...")
         
@@ -74,14 +77,9 @@ class PipelineService:
             from_segment: Optional segment index to reset and resume from.
         """
         # 1. Load Manifest
-        manifest_content = self.get_manifest(run_id_or_path)
-        if manifest_content.startswith("Error"):
-            return manifest_content
-            
-        try:
-            manifest_data = json.loads(manifest_content)
-        except:
-            return "Error: Invalid JSON in manifest."
+        manifest_data = self._load_manifest(run_id_or_path)
+        if isinstance(manifest_data, str):
+            return manifest_data
         
         run_id = manifest_data['run_id']
         manifest_path = os.path.join(os.getcwd(), "scorsese", "output", f"manifest_{run_id}.json")
@@ -107,8 +105,7 @@ class PipelineService:
                     print(f"  > Reset Segment {seg['index']}: {old_status} -> pending")
             
             # Save updated manifest
-            with open(manifest_path, 'w') as f:
-                json.dump(manifest_data, f, indent=2)
+            write_json_atomic(manifest_path, manifest_data)
             
             print(f"[Pipeline] Reset {reset_count} segment(s) starting from Segment {from_segment}.")
         
@@ -127,18 +124,12 @@ class PipelineService:
             run_id_or_path: Run ID or path to manifest.
             limit: Optional integer. If set, stops after processing 'limit' NEW segments.
         """
-        import json
         import time
         
         # 1. Load Manifest
-        manifest_content = self.get_manifest(run_id_or_path)
-        if manifest_content.startswith("Error"):
-            return manifest_content
-            
-        try:
-            manifest_data = json.loads(manifest_content)
-        except:
-            return "Error: Invalid JSON in manifest."
+        manifest_data = self._load_manifest(run_id_or_path)
+        if isinstance(manifest_data, str):
+            return manifest_data
             
         manifest_path = os.path.join(os.getcwd(), "scorsese", "output", f"manifest_{manifest_data['run_id']}.json")
         segments = manifest_data.get("segments", [])
@@ -226,8 +217,7 @@ class PipelineService:
                              print("  > WARNING: Frame extraction failed. Next segment will fail.")
                              
                     # Save State Immediately
-                    with open(manifest_path, 'w') as f:
-                        json.dump(manifest_data, f, indent=2)
+                    write_json_atomic(manifest_path, manifest_data)
                         
                 except Exception as e:
                     print(f"  > Error parsing result: {e}")
@@ -239,8 +229,7 @@ class PipelineService:
                 results_log.append(f"FAILED: {result_str}")
                 
             # Save State (failed)
-            with open(manifest_path, 'w') as f:
-                json.dump(manifest_data, f, indent=2)
+            write_json_atomic(manifest_path, manifest_data)
             
             # If failed, stop immediately regardless of limit
             if seg["status"] == "failed":
@@ -264,14 +253,9 @@ class PipelineService:
             return f"Validation Error: {e}"
 
         # 1. Load Manifest
-        manifest_content = self.get_manifest(run_id_or_path)
-        if manifest_content.startswith("Error"):
-            return manifest_content
-            
-        try:
-            manifest_data = json.loads(manifest_content)
-        except:
-            return "Error: Invalid JSON in manifest."
+        manifest_data = self._load_manifest(run_id_or_path)
+        if isinstance(manifest_data, str):
+            return manifest_data
             
         manifest_path = os.path.join(os.getcwd(), "scorsese", "output", f"manifest_{manifest_data['run_id']}.json")
         segments = manifest_data.get("segments", [])
@@ -336,15 +320,12 @@ class PipelineService:
                     log.append(f"Error: Segment {idx} not found for image update.")
                 
         # Save
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest_data, f, indent=2)
+        write_json_atomic(manifest_path, manifest_data)
             
         return "Manifest Updated:\n" + "\n".join(log)
 
     def stitch_videos(self, video_paths: list) -> str:
-        """Stitches videos together using MoviePy via script."""
-        import uuid
-        
+        """Stitches videos together (ffmpeg stream copy, else the MoviePy stitch template)."""
         # Manifest/RunID Support
         if len(video_paths) == 1 and isinstance(video_paths[0], str):
             inp = video_paths[0]
@@ -362,8 +343,7 @@ class PipelineService:
             if manifest_path:
                  try:
                      print(f"Loading paths from Manifest: {manifest_path}")
-                     with open(manifest_path, 'r') as f:
-                         data = json.load(f)
+                     data = read_json(manifest_path)
                          
                      # Handle Rich Manifest (Dict) vs Simple List
                      if isinstance(data, dict) and "segments" in data:
@@ -390,69 +370,53 @@ class PipelineService:
 
         final_filename = f"stitched_final_{uuid.uuid4().hex[:6]}.mp4"
         
-        # Prepare paths for the script
-        safe_paths = [p.replace(os.sep, "/") for p in video_paths]
-        # Create a string representation of the list of strings for the python script
-        paths_str_list = ", ".join([f'"{p}"' for p in safe_paths])
-        
-        print(f"  > Stitching {len(safe_paths)} clips: {safe_paths}")
-
-        stitching_script = f"""
-import os
-from moviepy import VideoFileClip, concatenate_videoclips
-
-video_paths = [{paths_str_list}]
-clips = []
-
-try:
-    for path in video_paths:
-        if os.path.exists(path):
-            clips.append(VideoFileClip(path))
-        else:
-            print(f"WARNING: File not found: {{path}}")
-    
-    if not clips:
-        print("NO_CLIPS_LOADED")
-        exit()
+        print(f"  > Stitching {len(video_paths)} clips: {video_paths}")
 
-    final_clip = concatenate_videoclips(clips, method="compose")
-    
-    # Save to scorsese/output
-    output_dir = os.path.join(os.getcwd(), "scorsese", "output")
-    os.makedirs(output_dir, exist_ok=True)
-    
-    output_path = os.path.join(output_dir, "{final_filename}")
-    final_clip.write_videofile(output_path, codec="libx264", audio_codec="aac")
-    
-    print(f"STITCH_SUCCESS: {{output_path}}")
+        # Fast path: identical codec settings -> concat without re-encoding
+        output_dir = os.path.join(os.getcwd(), "scorsese", "output")
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, final_filename)
+        if ffmpeg_tools.concat_copy(video_paths, output_path):
+            return f"SUCCESS. Stitched video saved to: {output_path}"
 
-except Exception as e:
-    print(f"STITCH_ERROR: {{e}}")
-finally:
-    # Cleanup clips to release file locks
-    for clip in clips:
-        try: clip.close()
-        except: pass
-"""
-        stitch_log = self.moviepy_service.run_script(stitching_script, save_name="stitch_manual")
+        stitch_log = self.moviepy_service.run_template("stitch", video_paths=list(video_paths), output_path=output_path)
         
         if "STITCH_SUCCESS" in stitch_log:
-            import re
-            match = re.search(r"STITCH_SUCCESS: (.*)", stitch_log)
-            if match:
-                return f"SUCCESS. Stitched video saved to: {match.group(1).strip()}"
+            return f"SUCCESS. Stitched video saved to: {output_path}"
         
         return f"Stitching failed. Logs:\n{stitch_log}"
         
-    def get_manifest(self, run_id_or_path: str) -> str:
-        """Retrieves the manifest content."""
+    def _manifest_path(self, run_id_or_path: str) -> str:
         # Check if it's a full path
         if os.path.exists(run_id_or_path):
-             path = run_id_or_path
-        else:
-             # Assume ID, look in output
-             path = os.path.join(os.getcwd(), "scorsese", "output", f"manifest_{run_id_or_path}.json")
-             
+            return run_id_or_path
+        # Assume ID, look in output
+        return os.path.join(os.getcwd(), "scorsese", "output", f"manifest_{run_id_or_path}.json")
+
+    def get_manifest_dict(self, run_id_or_path: str) -> Dict[str, Any]:
+        """
+        Loads the manifest already parsed, for callers that need the data rather
+        than the text. Raises FileNotFoundError, or ValueError on bad JSON.
+        """
+        path = self._manifest_path(run_id_or_path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        return read_json(path)
+
+    def _load_manifest(self, run_id_or_path: str) -> Union[Dict[str, Any], str]:
+        """get_manifest_dict, with failures returned as the usual "Error: ..." string."""
+        try:
+            return self.get_manifest_dict(run_id_or_path)
+        except FileNotFoundError:
+            return "Error: Manifest not found."
+        except ValueError:
+            return "Error: Invalid JSON in manifest."
+        except OSError as e:
+            return f"Error reading manifest: {e}"
+
+    def get_manifest(self, run_id_or_path: str) -> str:
+        """Retrieves the manifest content."""
+        path = self._manifest_path(run_id_or_path)
         if not os.path.exists(path):
             return "Error: Manifest not found."
             
@@ -465,17 +429,12 @@ finally:
     def update_segment_status(self, run_id_or_path: str, segment_index: int, status: str, notes: str = None) -> str:
         """Updates the status of a specific segment in the manifest."""
         # Resolve Path
-        if os.path.exists(run_id_or_path):
-             path = run_id_or_path
-        else:
-             path = os.path.join(os.getcwd(), "scorsese", "output", f"manifest_{run_id_or_path}.json")
-             
+        path = self._manifest_path(run_id_or_path)
         if not os.path.exists(path):
             return "Error: Manifest not found."
             
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
+            data = read_json(path)
             
             # Find Segment
             found = False
@@ -491,8 +450,7 @@ finally:
                 return f"Error: Segment index {segment_index} not found."
             
             # Save
-            with open(path, 'w') as f:
-                json.dump(data, f, indent=2)
+            write_json_atomic(path, data)
                 
             return f"Success. Updated Segment {segment_index} to '{status}'."
             
@@ -0,0 +1,247 @@
+"""
+Script Pool
+
+Pre-started worker processes for running generated MoviePy scripts and the
+fixed moviepy_templates edits. Each worker imports moviepy/numpy/PIL while it
+waits on standby, runs exactly one job and exits, so a script starts rendering
+immediately yet still gets a fresh process of its own: no globals, leaked clips
+or reader subprocesses carry over, and a hung or crashed job only affects its
+own caller.
+"""
+
+import io
+import os
+import re
+import sys
+import builtins
+import threading
+import traceback
+import contextlib
+import multiprocessing
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+MAX_CAPTURED_LINES = 10000  # per stream; progress bars can print a lot
+# Warm standby workers (~100 MB each with moviepy loaded). Edits run roughly one
+# at a time, so a couple is enough even on many-core hosts.
+MAX_STANDBY_WORKERS = 2
+
+# Media paths a script printed: Windows (C:\...) or POSIX (/...) absolute paths
+_OUTPUT_PATH_RE = re.compile(r'(?:[A-Za-z]:\\|/)[^\s"\']+\.(?:mp4|avi|mov|mp3|wav|png|jpg)')
+
+
+class _LineCapture(io.TextIOBase):
+    """
+    Write-only text stream that keeps the last `max_lines` lines and, if asked,
+    scans each line for media paths as it arrives instead of after the run.
+    Carriage returns (progress bars) count as line breaks.
+    """
+
+    def __init__(self, max_lines: int = MAX_CAPTURED_LINES, scan_paths: bool = False):
+        self.lines = deque(maxlen=max_lines)
+        self.paths: Dict[str, None] = {}  # insertion-ordered set
+        self._scan_paths = scan_paths
+        self._partial = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        data = self._partial + s.replace("\r\n", "\n").replace("\r", "\n")
+        *complete, self._partial = data.split("\n")
+        for line in complete:
+            self._add(line)
+        return len(s)
+
+    def _add(self, line: str):
+        self.lines.append(line)
+        if self._scan_paths:
+            for path in _OUTPUT_PATH_RE.findall(line):
+                self.paths[path] = None
+
+    def getvalue(self) -> str:
+        if self._partial:
+            self._add(self._partial)
+            self._partial = ""
+        return "\n".join(self.lines)
+
+
+def _warm_imports():
+    """Pay the heavy imports while the worker is on standby."""
+    for name in ("moviepy", "numpy", "PIL"):
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+
+def _run_captured(fn, cwd: str) -> Dict[str, Any]:
+    """
+    Runs `fn()` from `cwd` with stdout/stderr captured and returns the output,
+    the media paths it printed and an exit code.
+    """
+    out, err = _LineCapture(scan_paths=True), _LineCapture()
+    return_code = 0
+    prev_cwd = os.getcwd()
+    try:
+        os.chdir(cwd)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                fn()
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    return_code = e.code or 0
+                else:
+                    print(e.code, file=sys.stderr)
+                    return_code = 1
+            except BaseException:
+                traceback.print_exc()
+                return_code = 1
+    finally:
+        os.chdir(prev_cwd)
+    return {
+        "stdout": out.getvalue(),
+        "stderr": err.getvalue(),
+        "output_files": list(out.paths),
+        "returncode": return_code
+    }
+
+
+def _exec_script(script_code: str, script_path: str, cwd: str) -> Dict[str, Any]:
+    """Runs in a worker: executes the script as __main__ from `cwd`."""
+    def run():
+        code = compile(script_code, script_path, "exec")
+        exec(code, {"__name__": "__main__", "__file__": script_path, "__builtins__": builtins})
+    return _run_captured(run, cwd)
+
+
+def _exec_template(name: str, kwargs: Dict[str, Any], cwd: str) -> Dict[str, Any]:
+    """Runs in a worker: calls moviepy_templates.<name>(**kwargs) from `cwd`."""
+    def run():
+        from scorsese.services import moviepy_templates
+        getattr(moviepy_templates, name)(**kwargs)
+    return _run_captured(run, cwd)
+
+
+def _worker_main(conn):
+    """Standby worker: warm up, run one (fn, args) job, send back its result, exit."""
+    _warm_imports()
+    try:
+        fn, args = conn.recv()
+    except EOFError:
+        return  # pool shut down before a job arrived
+    try:
+        result = fn(*args)
+    except BaseException:
+        result = _failed(traceback.format_exc())
+    conn.send(result)
+    conn.close()
+
+
+def _failed(stderr: str) -> Dict[str, Any]:
+    return {"stdout": "", "stderr": stderr, "output_files": [], "returncode": 1}
+
+
+class ScriptPool:
+    """
+    Keeps `processes` warm single-use spawn workers on standby. Each job takes
+    one (spawning a cold one if none is ready) and a replacement starts warming
+    up right away.
+    """
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = processes or max(1, min(MAX_STANDBY_WORKERS, (os.cpu_count() or 2) - 1))
+        self._ctx = multiprocessing.get_context("spawn")
+        self._standby = deque()  # (Process, Connection)
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> Tuple[Any, Any]:
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        proc.start()
+        child_conn.close()
+        return proc, parent_conn
+
+    def _refill(self):
+        # Caller holds self._lock
+        while len(self._standby) < self.processes:
+            self._standby.append(self._spawn())
+
+    def _take(self) -> Tuple[Any, Any]:
+        with self._lock:
+            worker = None
+            while self._standby and worker is None:
+                proc, conn = self._standby.popleft()
+                if proc.is_alive():
+                    worker = (proc, conn)
+                else:
+                    conn.close()
+            if worker is None:
+                worker = self._spawn()
+            self._refill()
+        return worker
+
+    def start(self):
+        """
+        Starts the standby workers now instead of on the first script. They
+        import moviepy/numpy in the background, so the call returns immediately.
+        """
+        with self._lock:
+            self._refill()
+
+    def _apply(self, fn, args: tuple, timeout: float) -> Dict[str, Any]:
+        proc, conn = self._take()
+        answered = False
+        try:
+            conn.send((fn, args))
+            if not conn.poll(timeout):
+                raise multiprocessing.TimeoutError(f"Script did not finish within {timeout} seconds")
+            try:
+                result = conn.recv()
+            except EOFError:
+                # The worker died without answering (os._exit, segfault, OOM kill)
+                proc.join(1)
+                return _failed(f"Worker process exited unexpectedly (exit code {proc.exitcode}).")
+            answered = True
+            return result
+        finally:
+            conn.close()
+            # A worker that answered exits by itself; anything else is killed
+            if not answered and proc.is_alive():
+                proc.kill()
+                proc.join()
+
+    def run(self, script_code: str, script_path: str, cwd: str, timeout: float) -> Dict[str, Any]:
+        """
+        Executes a script in its own warm worker process. Raises
+        multiprocessing.TimeoutError after `timeout` seconds; only that
+        worker is killed, other running scripts are unaffected.
+        """
+        return self._apply(_exec_script, (script_code, script_path, cwd), timeout)
+
+    def run_template(self, name: str, kwargs: Dict[str, Any], cwd: str, timeout: float) -> Dict[str, Any]:
+        """Like run(), but calls a function from moviepy_templates with `kwargs`."""
+        return self._apply(_exec_template, (name, kwargs, cwd), timeout)
+
+    def terminate(self):
+        """Stops the standby workers (running jobs finish on their own)."""
+        with self._lock:
+            while self._standby:
+                proc, conn = self._standby.popleft()
+                conn.close()
+                proc.kill()
+                proc.join()
+
+
+_SCRIPT_POOL: Optional[ScriptPool] = None
+_SCRIPT_POOL_LOCK = threading.Lock()
+
+
+def get_script_pool() -> ScriptPool:
+    """Process-wide ScriptPool shared by every tool that runs scripts (safe from any thread)."""
+    global _SCRIPT_POOL
+    if _SCRIPT_POOL is None:
+        with _SCRIPT_POOL_LOCK:
+            if _SCRIPT_POOL is None:
+                _SCRIPT_POOL = ScriptPool()
+    return _SCRIPT_POOL
@@ -0,0 +1,53 @@
+"""
+TTL Cache
+
+Small persistent key -> value cache with expiry, for results that are costly to
+recompute but only valid for a while (uploaded frame URLs, generated music).
+Backed by diskcache when it is installed, otherwise by one JSON file per key,
+so entries survive restarts either way.
+"""
+
+import os
+import time
+import hashlib
+from typing import Any
+
+from .jsonio import read_json, write_json_atomic
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+
+def cache_key(*parts) -> str:
+    """Stable short key for any combination of reprable values."""
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TTLCache:
+    def __init__(self, directory: str, ttl: float):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+        self._cache = diskcache.Cache(directory) if diskcache is not None else None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._cache is not None:
+            return self._cache.get(key, default)
+        try:
+            entry = read_json(self._path(key))
+        except (OSError, ValueError):
+            return default
+        if entry.get("expires", 0) < time.time():
+            return default
+        return entry.get("value", default)
+
+    def set(self, key: str, value: Any):
+        if self._cache is not None:
+            self._cache.set(key, value, expire=self.ttl)
+            return
+        write_json_atomic(self._path(key), {"expires": time.time() + self.ttl, "value": value})
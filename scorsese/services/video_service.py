@@ -1,7 +1,15 @@
 import os
-import requests
 import uuid
-from typing import Optional, Dict, Any
+import time
+import tempfile
+from .http_session import download_file
+from .ttl_cache import TTLCache, cache_key
+from typing import Optional, Dict, Any, List
+
+# Uploaded frame URLs live about a day on the free hosts
+FRAME_CACHE_TTL = 24 * 3600
+# Agents re-poll in tight loops; answer repeats from memory for a few seconds
+STATUS_CACHE_TTL = 3.0
 
 class VideoService:
     def __init__(self, kie_client, image_upload_service, moviepy_service):
@@ -10,6 +18,8 @@ class VideoService:
         self.moviepy_service = moviepy_service
         self.output_dir = os.path.join(os.getcwd(), "scorsese", "output")
         os.makedirs(self.output_dir, exist_ok=True)
+        self.frame_cache = TTLCache(os.path.join(tempfile.gettempdir(), "scorsese_frame_cache"), FRAME_CACHE_TTL)
+        self._status_cache: Dict[str, tuple] = {}  # task_id -> (expires, result)
 
     def generate_segment(self, prompt: str, mode: str = "normal", image_url: str = None) -> str:
         """
@@ -30,8 +40,8 @@ class VideoService:
                 task_id = self.kie.generate_video_from_text(prompt, mode=mode)
             
             print(f"  > Task {task_id} started. Waiting for completion...")
-            # Auto-wait
-            result = self.kie.wait_for_task(task_id, poll_interval=5, timeout=120)
+            # Auto-wait (exponential backoff polling)
+            result = self.kie.wait_for_task(task_id, timeout=120)
             
             if result.get("state") == "success":
                 video_url = result.get("video_urls", [""])[0]
@@ -45,15 +55,45 @@ class VideoService:
 
     def check_status(self, task_id: str) -> str:
         """Checks status and downloads if ready."""
-        status = self.kie.get_task_status(task_id)
+        return self.check_statuses([task_id])[task_id]
+
+    def check_statuses(self, task_ids: List[str]) -> Dict[str, str]:
+        """
+        Checks several tasks, downloading any that are ready. Uncached tasks are
+        fetched in one concurrent batch. Finished tasks are answered from memory
+        from then on (no re-download), in-progress ones for STATUS_CACHE_TTL seconds.
+        """
+        results = {}
+        now = time.monotonic()
+        for task_id in task_ids:
+            cached = self._status_cache.get(task_id)
+            if cached and cached[0] > now:
+                results[task_id] = cached[1]
+        
+        pending = [t for t in task_ids if t not in results]
+        if pending:
+            for task_id, status in self.kie.get_task_statuses(pending).items():
+                results[task_id] = self._record_status(task_id, status)
+        return results
+
+    def _record_status(self, task_id: str, status: Dict[str, Any]) -> str:
+        expires = float("inf")
         if status['state'] == 'success':
             video_url = status.get('video_urls', [''])[0]
             local_path = self._download_file(video_url)
-            return f"Success! Video URL: {video_url}\nSaved locally: {local_path}"
+            result = f"Success! Video URL: {video_url}\nSaved locally: {local_path}"
+            if not local_path:
+                expires = time.monotonic() + STATUS_CACHE_TTL  # retry the download later
         elif status['state'] == 'fail':
-            return f"Failed: {status.get('failMsg')}"
+            result = f"Failed: {status.get('failMsg')}"
+        elif status['state'] == 'error':
+            result = f"Error checking status: {status.get('msg')}"
+            expires = time.monotonic() + STATUS_CACHE_TTL
         else:
-            return f"Status: {status['state']} (Waiting...)"
+            result = f"Status: {status['state']} (Waiting...)"
+            expires = time.monotonic() + STATUS_CACHE_TTL
+        self._status_cache[task_id] = (expires, result)
+        return result
 
     def extend_segment(self, video_path: str, prompt: str, mode: str = "normal") -> str:
         """
@@ -62,24 +102,11 @@ class VideoService:
         print(f"[VideoService] Extending {video_path}...")
         
         # 1. Extract Last Frame
-        img_name = f"frame_extend_{uuid.uuid4().hex[:6]}.png"
-        extraction_script = f"""
-import os
-from moviepy import VideoFileClip
-video_path = r"{video_path}"
-output_path = os.path.join(os.getcwd(), "scorsese", "{img_name}")
-try:
-    with VideoFileClip(video_path) as clip:
-        clip.save_frame(output_path, t=clip.duration - 0.1)
-    print(f"FRAME_SAVED: {{output_path}}")
-except Exception as e:
-    print(f"EXTRACTION_ERROR: {{e}}")
-"""
-        out_log = self.moviepy_service.run_script(extraction_script)
-        extracted_path = os.path.join(os.getcwd(), "scorsese", img_name)
-        
-        if not os.path.exists(extracted_path):
-            return f"Error: Frame extraction failed. Log: {out_log}"
+        extracted_path = os.path.join(os.getcwd(), "scorsese", f"frame_extend_{uuid.uuid4().hex[:6]}.png")
+        try:
+            self.moviepy_service.extract_last_frame(video_path, extracted_path)
+        except Exception as e:
+            return f"Error: {e}"
         
         try:
             # 2. Upload
@@ -97,7 +124,26 @@ except Exception as e:
             return f"Error extending video: {e}"
 
     def extract_and_upload_last_frame(self, video_source: str) -> str:
-        """Download remote video OR use local path, extract frame, upload."""
+        """
+        Download remote video OR use local path, extract frame, upload.
+        Uploaded frame URLs are cached per source (local files also by mtime and
+        size), so retries and re-plans skip the download/decode/upload.
+        """
+        try:
+            st = os.stat(video_source)
+            key = cache_key(os.path.abspath(video_source), st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = cache_key(video_source)
+        url = self.frame_cache.get(key)
+        if url:
+            print(f"  > Using cached last frame: {url}")
+            return url
+        url = self._extract_and_upload_last_frame(video_source)
+        if url.startswith("http"):
+            self.frame_cache.set(key, url)
+        return url
+
+    def _extract_and_upload_last_frame(self, video_source: str) -> str:
         temp_vid = None
         is_temp = False
         
@@ -115,22 +161,12 @@ except Exception as e:
         else:
             return f"Error: Invalid video source (not a URL or local path): {video_source}"
             
-        # Extract (reuse extend logic parts, but returns url)
-        img_name = f"frame_bridge_{uuid.uuid4().hex[:6]}.png"
-        extraction_script = f"""
-import os
-from moviepy import VideoFileClip
-video_path = r"{temp_vid}"
-output_path = os.path.join(os.getcwd(), "scorsese", "{img_name}")
-try:
-    with VideoFileClip(video_path) as clip:
-        clip.save_frame(output_path, t=clip.duration - 0.1)
-    print(f"FRAME_SAVED: {{output_path}}")
-except Exception as e:
-    print(f"EXTRACTION_ERROR: {{e}}")
-"""
-        self.moviepy_service.run_script(extraction_script)
-        extracted_path = os.path.join(os.getcwd(), "scorsese", img_name)
+        # Extract
+        extracted_path = os.path.join(os.getcwd(), "scorsese", f"frame_bridge_{uuid.uuid4().hex[:6]}.png")
+        try:
+            self.moviepy_service.extract_last_frame(temp_vid, extracted_path)
+        except Exception as e:
+            print(f"  > {e}")
         
         # Cleanup temp video (only if we downloaded it)
         if is_temp and temp_vid:
@@ -148,11 +184,7 @@ except Exception as e:
         fname = f"{prefix}{uuid.uuid4().hex[:6]}.mp4"
         local_path = os.path.join(self.output_dir, fname)
         try:
-            with requests.get(url, stream=True) as r:
-                r.raise_for_status()
-                with open(local_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
+            download_file(url, local_path)
             return local_path
         except Exception as e:
             print(f"Download Error: {e}")